@@ -0,0 +1,7 @@
+import sys
+
+from retrodrops.cli import main
+
+# Совместный сбор с обеих бирж; то же, что «retrodrops collect-all»
+if __name__ == "__main__":
+    sys.exit(main(["collect-all"] + sys.argv[1:]))
@@ -0,0 +1,7 @@
+"""
+Сбор цен монет после листинга на Binance и Bybit и сравнение с ETH.
+
+Запуск: retrodrops <команда> или python -m retrodrops <команда> (см. cli.py).
+"""
+
+__version__ = "0.1.0"
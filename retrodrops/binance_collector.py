@@ -0,0 +1,420 @@
+import csv
+import time
+from datetime import datetime, timedelta, timezone
+
+from . import tracing
+from .http_pool import HostPool
+from .listing_index import ListingIndex
+from .metrics_store import save_metrics
+from .result_table import DEFAULT_FORMAT, ResultTable, output_path, write_result
+from .tracing import span, symbol_scope
+
+# Equivalent Binance API hosts; requests are balanced across them with hedging (http_pool.HostPool)
+hosts = [
+    "https://api.binance.com",
+    "https://api1.binance.com",
+    "https://api2.binance.com",
+    "https://api3.binance.com",
+    "https://api4.binance.com",
+]
+
+# Binance API endpoint for klines (candlesticks data)
+klines_path = "/api/v3/klines"
+
+# HTTP-клиент с пулами соединений для всех хостов
+client = HostPool(hosts)
+
+# Кэш дневных свечей по закрытым периодам: {(symbol, start_time, end_time): свечи}
+_kline_cache = {}
+
+# Постоянный индекс дат и цен листинга (listing_index.ListingIndex); None — листинг ищется при каждом запуске
+listing_index = None
+
+# Таблица последних цен из WebSocket (price_feed.PriceFeed); None — цены запрашиваются через REST
+price_feed = None
+
+# Заголовки отформатированной таблицы
+HEADERS = [
+    "Symbol", "Listing Date", "Listing Price",
+    "Price After 90 Days", "Price After 180 Days", "Current Price",
+    "ETH Listing Price", "ETH Price After 90 Days", "ETH Price After 180 Days", "ETH Current Price",
+    "Peak Price", "Lowest Price", "Peak-to-ETH Ratio", "Lowest-to-ETH Ratio",
+    "Rel Change Current", "Rel Change 90 Days", "Rel Change 180 Days"
+]
+
+# Function to fetch the first available data (listing date and price) from the Kline data
+def fetch_listing_date(symbol):
+    if listing_index is not None:
+        entry = listing_index.get("binance", symbol)
+        if entry is not None:
+            listing_ts, listing_price = entry
+            return datetime.fromtimestamp(listing_ts / 1000, tz=timezone.utc), listing_price
+
+    params = {
+        "symbol": symbol,
+        "interval": "1d",  # Daily candles
+        "startTime": 0  # Fetch from the very beginning
+    }
+    response = client.get(klines_path, params=params)
+    
+    if response.status_code != 200:
+        print(f"Error: Unable to fetch Kline data for {symbol}. Status code: {response.status_code}")
+        return None, None
+    
+    data = response.json()
+    
+    if not data:
+        print(f"Error: No historical data found for {symbol}. It may not be listed or available.")
+        return None, None
+
+    try:
+        listing_date = datetime.fromtimestamp(data[0][0] / 1000, tz=timezone.utc)
+        listing_price = round(float(data[0][4]), 4)
+        if listing_index is not None:
+            listing_index.put("binance", symbol, data[0][0], listing_price)
+        return listing_date, listing_price
+    except (IndexError, ValueError) as e:
+        print(f"Error processing the response data: {e}")
+        return None, None
+
+# Function to fetch daily klines; fully closed periods are served from the cache
+def fetch_klines(symbol, start_time, end_time):
+    key = (symbol, start_time, end_time)
+    if key in _kline_cache:
+        return _kline_cache[key]
+    params = {
+        "symbol": symbol,
+        "interval": "1d",
+        "startTime": start_time,
+        "endTime": end_time
+    }
+    response = client.get(klines_path, params=params)
+    data = response.json()
+    if response.status_code == 200 and end_time < time.time() * 1000 - 86400000:
+        _kline_cache[key] = data
+    return data
+
+# Function to fetch price at a specific time
+def fetch_price(symbol, start_time, end_time):
+    data = fetch_klines(symbol, start_time, end_time)
+    if data:
+        return round(float(data[0][4]), 4)
+    return None
+
+# Function to fetch the peak price within a specific time range
+def fetch_peak_price(symbol, start_time, end_time):
+    data = fetch_klines(symbol, start_time, end_time)
+    if data:
+        high_prices = [float(kline[2]) for kline in data]
+        return round(max(high_prices), 4) if high_prices else None
+    return None
+
+# Function to fetch the lowest price within a specific time range
+def fetch_lowest_price(symbol, start_time, end_time):
+    data = fetch_klines(symbol, start_time, end_time)
+    if data:
+        low_prices = [float(kline[3]) for kline in data]
+        return round(min(low_prices), 4) if low_prices else None
+    return None
+
+# Function to fetch the current price of the symbol
+def fetch_current_price(symbol):
+    if price_feed is not None:
+        # Первые цены ждут один раз при запуске подписки (PriceFeed.wait); символ без цены сразу запрашивается через REST
+        price = price_feed.get(symbol, timeout=0)
+        if price is not None:
+            return round(price, 4)
+    response = client.get("/api/v3/ticker/price", params={"symbol": symbol})
+    if response.status_code == 200:
+        price = float(response.json()["price"])
+        return round(price, 4)
+    else:
+        print(f"Error: Unable to fetch current price for {symbol}. Status code: {response.status_code}")
+        return None
+
+# Function to calculate relative change between ETH and coin
+def calculate_relative_change(coin_change_percent, eth_change_percent):
+    try:
+        coin_factor = 1 + coin_change_percent / 100
+        eth_factor = 1 + eth_change_percent / 100
+        if coin_factor == 0:
+            raise ValueError("Coin factor cannot be zero.")
+        return round(eth_factor / coin_factor, 2)
+    except Exception as e:
+        print(f"Error calculating relative change: {e}")
+        return None
+
+# Function to fetch the timestamp of peak or lowest price
+def fetch_timestamp_of_extreme(symbol, start_time, end_time, extreme_type="peak"):
+    data = fetch_klines(symbol, start_time, end_time)
+    if data:
+        if extreme_type == "peak":
+            extreme_value = max(data, key=lambda kline: float(kline[2]))
+        else:
+            extreme_value = min(data, key=lambda kline: float(kline[3]))
+        return extreme_value[0]  # Return timestamp
+    return None
+
+def save_to_excel(data, filename="output.xls"):
+    """
+    Сохраняет данные в Excel файл.
+
+    :param data: Список строк (каждая строка - список значений для таблицы)
+    :param filename: Имя файла для сохранения
+    """
+    import xlwt
+
+    wb = xlwt.Workbook()
+    sheet = wb.add_sheet("Data")
+
+    # Заполняем заголовки
+    for col_num, header in enumerate(HEADERS):
+        sheet.write(0, col_num, header)
+
+    # Заполняем данные
+    for row_num, row in enumerate(data, start=1):
+        for col_num, value in enumerate(row):
+            sheet.write(row_num, col_num, value)
+
+    # Сохраняем файл
+    wb.save(filename)
+    print(f"Данные успешно сохранены в {filename}")
+
+
+def read_symbols_from_csv(filename):
+    """
+    Читает символы из CSV-файла.
+
+    :param filename: Имя CSV-файла
+    :return: Список символов
+    """
+    symbols = []
+    try:
+        with open(filename, newline='', encoding='utf-8') as csvfile:
+            reader = csv.reader(csvfile)
+            for row in reader:
+                if row:  # Пропускаем пустые строки
+                    symbols.append(row[0].strip())
+    except FileNotFoundError:
+        print(f"Файл {filename} не найден.")
+    except Exception as e:
+        print(f"Ошибка при чтении файла: {e}")
+    return symbols
+
+
+
+def fetch_ticker_metrics(symbol, include_eth=True):
+    """
+    Собирает числовые метрики монеты без форматирования.
+
+    :param symbol: Торговая пара (например, "BTCUSDT")
+    :param include_eth: Запрашивать цены ETH; False — поля eth_* остаются None (их заполняет вызывающий)
+    :return: Словарь метрик (см. metrics_store.METRIC_FIELDS) или None при ошибке
+    """
+    try:
+        with span("listing"):
+            listing_date, listing_price = fetch_listing_date(symbol)
+        if not listing_date:
+            raise ValueError(f"No listing data found for {symbol}.")
+
+        ninety_days_later = listing_date + timedelta(days=90)
+        one_eighty_days_later = listing_date + timedelta(days=180)
+        start_time_for_highs_dips = listing_date + timedelta(minutes=15)
+
+        with span("history"):
+            price_90_days = fetch_price(symbol, int(ninety_days_later.timestamp() * 1000), int(ninety_days_later.timestamp() * 1000 + 86400000))
+            price_180_days = fetch_price(symbol, int(one_eighty_days_later.timestamp() * 1000), int(one_eighty_days_later.timestamp() * 1000 + 86400000))
+            current_price = fetch_current_price(symbol)
+
+            peak_price_180 = fetch_peak_price(symbol, int(start_time_for_highs_dips.timestamp() * 1000), int(one_eighty_days_later.timestamp() * 1000))
+            lowest_price_180 = fetch_lowest_price(symbol, int(start_time_for_highs_dips.timestamp() * 1000), int(one_eighty_days_later.timestamp() * 1000))
+
+            peak_timestamp = fetch_timestamp_of_extreme(symbol, int(start_time_for_highs_dips.timestamp() * 1000), int(one_eighty_days_later.timestamp() * 1000), "peak")
+            lowest_timestamp = fetch_timestamp_of_extreme(symbol, int(start_time_for_highs_dips.timestamp() * 1000), int(one_eighty_days_later.timestamp() * 1000), "low")
+
+        eth_symbol = "ETHUSDT"
+        eth_listing_price = eth_price_90_days = eth_price_180_days = eth_current_price = None
+        eth_price_at_peak = eth_price_at_lowest = None
+        if include_eth:
+            with span("eth"):
+                eth_listing_price = fetch_price(eth_symbol, int(listing_date.timestamp() * 1000), int(listing_date.timestamp() * 1000 + 86400000))
+                eth_price_90_days = fetch_price(eth_symbol, int(ninety_days_later.timestamp() * 1000), int(ninety_days_later.timestamp() * 1000 + 86400000))
+                eth_price_180_days = fetch_price(eth_symbol, int(one_eighty_days_later.timestamp() * 1000), int(one_eighty_days_later.timestamp() * 1000 + 86400000))
+                eth_current_price = fetch_current_price(eth_symbol)
+
+                eth_price_at_peak = fetch_price(eth_symbol, peak_timestamp, peak_timestamp + 86400000) if peak_timestamp else None
+                eth_price_at_lowest = fetch_price(eth_symbol, lowest_timestamp, lowest_timestamp + 86400000) if lowest_timestamp else None
+    except Exception as e:
+        print(f"Ошибка при обработке {symbol}: {e}")
+        return None
+
+    return {
+        "symbol": symbol,
+        "listing_ts": int(listing_date.timestamp() * 1000),
+        "listing_price": listing_price,
+        "price_90d": price_90_days,
+        "price_180d": price_180_days,
+        "current_price": current_price,
+        "eth_listing_price": eth_listing_price,
+        "eth_price_90d": eth_price_90_days,
+        "eth_price_180d": eth_price_180_days,
+        "eth_current_price": eth_current_price,
+        "peak_price": peak_price_180,
+        "peak_ts": peak_timestamp,
+        "lowest_price": lowest_price_180,
+        "lowest_ts": lowest_timestamp,
+        "eth_at_peak": eth_price_at_peak,
+        "eth_at_lowest": eth_price_at_lowest,
+    }
+
+
+def build_ticker_row(symbol, metrics):
+    """
+    Формирует строку таблицы из метрик, полученных fetch_ticker_metrics.
+
+    :param symbol: Торговая пара
+    :param metrics: Словарь метрик или None
+    :return: Список значений для таблицы
+    """
+    # Удаляем "USDT" из названия монеты для отображения
+    base_symbol = symbol.replace("USDT", "")
+
+    if metrics is None:
+        # Если данные не удалось получить, создаём пустую строку
+        return [base_symbol] + [""] * 15
+
+    try:
+        listing_date = datetime.fromtimestamp(metrics["listing_ts"] / 1000, tz=timezone.utc)
+        listing_price = metrics["listing_price"]
+        price_90_days = metrics["price_90d"]
+        price_180_days = metrics["price_180d"]
+        current_price = metrics["current_price"]
+        peak_price_180 = metrics["peak_price"]
+        lowest_price_180 = metrics["lowest_price"]
+        eth_listing_price = metrics["eth_listing_price"]
+        eth_price_90_days = metrics["eth_price_90d"]
+        eth_price_180_days = metrics["eth_price_180d"]
+        eth_current_price = metrics["eth_current_price"]
+        eth_price_at_peak = metrics["eth_at_peak"]
+        eth_price_at_lowest = metrics["eth_at_lowest"]
+
+        def calculate_change(current, base):
+            if current is None or base is None:
+                return "-"
+            return round((current - base) / base * 100, 2)
+
+        def format_price_with_change(price, change):
+            if price is None:
+                return "-"
+            if price < 0.01:
+                return f"{price:.5f} ({change:+.0f}%)"
+            if price < 0.1:
+                return f"{price:.4f} ({change:+.0f}%)"
+            if price < 1:
+                return f"{price:.3f} ({change:+.0f}%)"
+            if price < 10:
+                return f"{price:.2f} ({change:+.0f}%)"
+            if price < 100:
+                return f"{price:.1f} ({change:+.0f}%)"
+            if price > 100:
+                return f"{price:.0f} ({change:+.0f}%)"
+            return f"{price:.2f} ({change:+.0f}%)" if change != "-" else f"{price:.2f}"
+
+        rel_change_current = calculate_relative_change(calculate_change(current_price, listing_price), calculate_change(eth_current_price, eth_listing_price))
+        rel_change_90 = calculate_relative_change(calculate_change(price_90_days, listing_price), calculate_change(eth_price_90_days, eth_listing_price))
+        rel_change_180 = calculate_relative_change(calculate_change(price_180_days, listing_price), calculate_change(eth_price_180_days, eth_listing_price))
+
+        peak_to_eth_ratio = calculate_relative_change(calculate_change(peak_price_180, listing_price), calculate_change(eth_price_at_peak, eth_listing_price)) if peak_price_180 and eth_price_at_peak else "-"
+        lowest_to_eth_ratio = calculate_relative_change(calculate_change(lowest_price_180, listing_price), calculate_change(eth_price_at_lowest, eth_listing_price)) if lowest_price_180 and eth_price_at_lowest else "-"
+
+        # Формируем строку для таблицы
+        row = [
+            base_symbol,  # Symbol
+            listing_date.strftime('%d.%m.%y'),  # Listing Date
+            format_price_with_change(listing_price, 0),  # Listing Price (no change)
+            format_price_with_change(price_90_days, calculate_change(price_90_days, listing_price)),  # Price After 90 Days
+            format_price_with_change(price_180_days, calculate_change(price_180_days, listing_price)),  # Price After 180 Days
+            format_price_with_change(current_price, calculate_change(current_price, listing_price)),  # Current Price
+            format_price_with_change(eth_listing_price, 0),  # ETH Listing Price
+            format_price_with_change(eth_price_90_days, calculate_change(eth_price_90_days, eth_listing_price)),  # ETH Price After 90 Days
+            format_price_with_change(eth_price_180_days, calculate_change(eth_price_180_days, eth_listing_price)),  # ETH Price After 180 Days
+            format_price_with_change(eth_current_price, calculate_change(eth_current_price, eth_listing_price)),  # ETH Current Price
+            format_price_with_change(peak_price_180, calculate_change(peak_price_180, listing_price)),  # Peak Price
+            format_price_with_change(lowest_price_180, calculate_change(lowest_price_180, listing_price)),  # Lowest Price
+            peak_to_eth_ratio, lowest_to_eth_ratio,  # Ratios
+            rel_change_current, rel_change_90, rel_change_180  # Relative Changes
+        ]
+
+    except Exception as e:
+        print(f"Ошибка при обработке {symbol}: {e}")
+        # Если данные не удалось получить, создаём пустую строку
+        row = [base_symbol] + [""] * 15
+
+    return row
+
+
+def get_ticker_data(symbol):
+    return build_ticker_row(symbol, fetch_ticker_metrics(symbol))
+
+def main(input_file="input.csv", output_name="ticker_data", metrics_file="metrics.db",
+         live_feed=False, output_format=DEFAULT_FORMAT, trace_file=None, profile_dir=None,
+         listing_file="metrics.db"):
+    """
+    :param input_file: Имя входного CSV-файла
+    :param output_name: Имя выходного файла без расширения
+    :param metrics_file: Таблица метрик для быстрых выборок (metrics_store.py)
+    :param listing_file: Индекс дат листинга (listing_index.py); None — не использовать
+    """
+    global price_feed, listing_index
+    output_file = output_path(output_name, output_format)  # Имя выходного файла
+
+    symbols = read_symbols_from_csv(input_file)
+    if not symbols:
+        print("Список символов пуст. Проверьте файл.")
+        return
+
+    if trace_file:
+        tracing.enable(profile_dir)
+
+    # Индекс, созданный здесь, закрывается по завершении; подписка заменяется только на время запуска
+    own_index = bool(listing_file) and listing_index is None
+    if own_index:
+        listing_index = ListingIndex(listing_file)
+    previous_feed = price_feed
+
+    all_data = []
+    all_metrics = []
+    symbol_metrics = []  # Метрики по всем символам, включая None для необработанных
+    try:
+        if live_feed:
+            # Текущие цены берём из WebSocket вместо запроса на каждый символ
+            from .price_feed import PriceFeed
+            price_feed = PriceFeed("binance", symbols + ["ETHUSDT"]).start()
+            if not price_feed.wait(timeout=15):
+                print("Не по всем символам получены цены из WebSocket, недостающие будут запрошены через REST.")
+
+        for symbol in symbols:
+            with symbol_scope(symbol):
+                metrics = fetch_ticker_metrics(symbol)
+                with span("compute"):
+                    all_data.append(build_ticker_row(symbol, metrics))  # Получаем строку данных
+            symbol_metrics.append(metrics)
+            if metrics is not None:
+                all_metrics.append(metrics)
+            time.sleep(1)
+    finally:
+        if price_feed is not previous_feed:
+            price_feed.stop()
+        price_feed = previous_feed
+        if own_index:
+            listing_index.close()
+            listing_index = None
+
+    # Сохраняем весь список сразу: числовые колонки (Parquet/Arrow) или отформатированную таблицу (XLS/CSV)
+    with span("output"):
+        write_result(ResultTable.from_metrics("binance", symbol_metrics, HEADERS, all_data, symbols), output_file, output_format)
+        save_metrics(metrics_file, "binance", all_metrics)
+
+    if trace_file:
+        tracing.get_tracer().export(trace_file)
+
@@ -0,0 +1,581 @@
+import requests
+import csv
+from datetime import datetime, timezone, timedelta
+
+from . import tracing
+from .listing_index import ListingIndex
+from .metrics_store import save_metrics
+from .result_table import DEFAULT_FORMAT, ResultTable, output_path, write_result
+from .tracing import span, symbol_scope
+
+# Bybit API endpoint
+base_url = "https://api.bybit.com/v5/market/kline"
+
+# Пул HTTP-соединений для всех запросов к Bybit
+session = requests.Session()
+
+# Кэш свечей по закрытым периодам: {параметры запроса: список свечей}
+_kline_cache = {}
+
+# Постоянный индекс дат и цен листинга (listing_index.ListingIndex); None — листинг ищется при каждом запуске
+listing_index = None
+
+# Таблица последних цен из WebSocket (price_feed.PriceFeed); None — цены запрашиваются через REST
+price_feed = None
+
+# Заголовки отформатированной таблицы
+HEADERS = [
+    "Монета", "Дата Листинга", "Цена Листинга",
+    "Цена спустя 90 дней", "Цена спустя 180 дней", "Текущая цена",
+    "Цена ETH на листинге", "Цена ETH спустя 90 дней", "Цена ETH спустя 180 дней", "Текущая цена ETH",
+    "Пиковая цена", "Минимальная цена", "ETH на пике монеты", "ETH на минимуме монеты",
+    "Отношение на пике", "Отношение на минимуме", "Отношение текущей цены", 
+    "Отношение спустя 90 дней", "Отношение спустя 180 дней"
+]
+
+def fetch_candles(params):
+    """
+    Запрашивает свечи с Bybit. Ответы по полностью закрытым периодам кэшируются.
+
+    :param params: Параметры запроса /v5/market/kline
+    :return: Кортеж (код статуса, список свечей). Ошибку Bybit при HTTP 200 (retCode != 0)
+             возвращает как код статуса retCode без свечей; такие ответы не кэшируются.
+    """
+    key = tuple(sorted(params.items()))
+    if key in _kline_cache:
+        return 200, _kline_cache[key]
+
+    with span("GET /v5/market/kline", cat="http"):
+        response = session.get(base_url, params=params)
+    if response.status_code != 200:
+        return response.status_code, []
+
+    data = response.json()
+    if data.get("retCode") != 0:
+        print(f"Ошибка Bybit для {params.get('symbol')}: {data.get('retMsg')} (retCode {data.get('retCode')})")
+        return data.get("retCode"), []
+
+    candles = data.get("result", {}).get("list", [])
+    if params["end"] < datetime.now(timezone.utc).timestamp() * 1000 - 86400000:
+        _kline_cache[key] = candles
+    return response.status_code, candles
+
+def get_listing_date_bybit(symbol):
+    """
+    Быстрый поиск даты листинга монеты с использованием бинарного поиска по времени.
+    """
+    today = datetime.now(timezone.utc)
+    end_time = int(today.timestamp() * 1000)  # Конец (текущее время)
+    start_time = 0  # Начало (эпоха Unix)
+
+    interval = "D"  # Используем дневные свечи для точности
+    print(f"Начинаем поиск даты листинга для {symbol}...")
+
+    while start_time <= end_time:
+        mid_time = (start_time + end_time) // 2  # Середина диапазона
+        params = {
+            "category": "spot",
+            "symbol": symbol,
+            "interval": interval,
+            "start": mid_time,
+            "end": end_time
+        }
+
+        status_code, candles = fetch_candles(params)
+        if status_code != 200:
+            print(f"Ошибка: Невозможно получить данные с Bybit. Код статуса: {status_code}")
+            return None, None
+
+        if candles:
+            # Если свечи найдены, сужаем диапазон к более раннему времени
+            end_time = int(candles[-1][0]) - 1  # Последняя свеча
+            listing_timestamp = int(candles[-1][0])
+        else:
+            # Если свечей нет, сужаем диапазон к более позднему времени
+            start_time = mid_time + 1
+
+    # Возвращаем найденную дату листинга
+    if 'listing_timestamp' in locals():
+        listing_date = datetime.fromtimestamp(listing_timestamp / 1000, tz=timezone.utc)
+        return listing_date, listing_timestamp
+    print("Дата листинга не найдена.")
+    return None, None
+
+def get_listing_price(symbol, listing_timestamp):
+    """
+    Получает цену монеты на листинге, используя закрытие дневной свечи в день листинга.
+    """
+    interval = "D"  # Используем дневные свечи
+    start_time = listing_timestamp
+    end_time = listing_timestamp + 86400000  # Конец того же дня (1 день в миллисекундах)
+
+    params = {
+        "category": "spot",
+        "symbol": symbol,
+        "interval": interval,
+        "start": start_time,
+        "end": end_time
+    }
+
+    status_code, candles = fetch_candles(params)
+    if status_code != 200:
+        print(f"Ошибка: Невозможно получить данные о свечах с Bybit. Код статуса: {status_code}")
+        return None
+
+    if not candles:
+        print("Данные дневной свечи отсутствуют для определения цены на листинге.")
+        return None
+
+    # Цена закрытия первой дневной свечи
+    listing_price = float(candles[0][4])  # Индекс 0 — первая дневная свеча
+    return listing_price
+
+def get_listing(symbol):
+    """
+    Время и цена листинга: из индекса, а если символа в нём нет — поиском по свечам.
+
+    :return: Кортеж (listing_timestamp в мс, цена листинга) или (None, None)
+    """
+    if listing_index is not None:
+        entry = listing_index.get("bybit", symbol)
+        if entry is not None:
+            return entry
+
+    listing_date, listing_timestamp = get_listing_date_bybit(symbol)
+    if listing_timestamp is None:
+        return None, None
+    listing_price = get_listing_price(symbol, listing_timestamp)
+    if listing_index is not None and listing_price is not None:
+        listing_index.put("bybit", symbol, listing_timestamp, listing_price)
+    return listing_timestamp, listing_price
+
+def get_price_after_days(symbol, listing_timestamp, days):
+    """
+    Получает цену монеты спустя определённое количество дней после даты листинга.
+    """
+    interval = "D"  # Дневные свечи
+    start_time = listing_timestamp + days * 86400000  # Начало через `days` дней
+    end_time = start_time + 86400000  # Конец дня
+
+    params = {
+        "category": "spot",
+        "symbol": symbol,
+        "interval": interval,
+        "start": start_time,
+        "end": end_time
+    }
+
+    status_code, candles = fetch_candles(params)
+    if status_code != 200:
+        print(f"Ошибка: Невозможно получить данные о свечах с Bybit. Код статуса: {status_code}")
+        return "-"  # Если запрос не удался, вернуть прочерк
+
+    if not candles:
+        print(f"Данные свечей отсутствуют для {symbol} спустя {days} дней.")
+        return "-"  # Если свечи отсутствуют, вернуть прочерк
+
+    # Цена закрытия дневной свечи
+    return float(candles[0][4])
+
+
+def get_current_price(symbol):
+    """
+    Получает текущую цену монеты с помощью эндпоинта /tickers.
+    Если запущена подписка на тикеры (price_feed), цена берётся из неё.
+    """
+    if price_feed is not None:
+        # Первые цены ждут один раз при запуске подписки (PriceFeed.wait); символ без цены сразу запрашивается через REST
+        price = price_feed.get(symbol, timeout=0)
+        if price is not None:
+            return price
+
+    params = {
+        "category": "spot",
+        "symbol": symbol
+    }
+
+    with span("GET /v5/market/tickers", cat="http"):
+        response = session.get(f"https://api.bybit.com/v5/market/tickers", params=params)
+    if response.status_code != 200:
+        print(f"Ошибка: Невозможно получить текущую цену с Bybit. Код статуса: {response.status_code}")
+        return None
+
+    data = response.json()
+    result = data.get("result", {}).get("list", [])
+    if result:
+        price = result[0].get("lastPrice")
+        return float(price) if price else None
+
+    print(f"Ошибка: Текущая цена для пары {symbol} отсутствует.")
+    return None
+
+def calculate_change(current, base):
+    """
+    Вычисляет изменение в процентах относительно базовой цены.
+    """
+    if current == "-" or base == "-" or current is None or base is None:
+        return "-"  # Если данные отсутствуют, вернуть прочерк
+    change = (current - base) / base * 100
+    return change
+
+
+
+def format_price_with_change(price, change):
+    """
+    Форматирует цену с отображением изменения.
+    """
+    if price == "-" or change == "-":
+        return "-"  # Если данные отсутствуют, вернуть прочерк
+    change = round(change, 0)
+    if price is None:
+        return "-"
+    if price < 0.01:
+        return f"{price:.5f} ({change:+.0f}%)"
+    if price < 0.1:
+        return f"{price:.4f} ({change:+.0f}%)"
+    if price < 1:
+        return f"{price:.3f} ({change:+.0f}%)"
+    if price < 10:
+        return f"{price:.2f} ({change:+.0f}%)"
+    if price < 100:
+        return f"{price:.1f} ({change:+.0f}%)"
+    if price > 100:
+        return f"{price:.0f} ({change:+.0f}%)"
+
+def get_eth_price_at_time(timestamp):
+    """
+    Получает цену ETH (пара ETHUSDT) на заданный момент времени.
+    """
+    params = {
+        "category": "spot",
+        "symbol": "ETHUSDT",
+        "interval": "1d",
+        "start": timestamp,
+        "end": timestamp + 86400000  # Один день в миллисекундах
+    }
+
+    status_code, candles = fetch_candles(params)
+    if status_code != 200:
+        print(f"Ошибка: Невозможно получить цену ETH с Bybit. Код статуса: {status_code}")
+        return None
+
+    if candles:
+        return int(candles[0][4])  # Цена закрытия свечи
+    return None
+
+
+def get_peak_and_lowest_price(symbol, listing_timestamp, days=180):
+    """
+    Определяет пиковую и наименьшую цены монеты в диапазоне с даты листинга до `days` дней.
+    Также возвращает даты, когда эти цены были зафиксированы.
+    """
+    interval = "D"  # Дневные свечи
+    start_time = listing_timestamp
+    end_time = listing_timestamp + days * 86400000  # `days` дней в миллисекундах
+
+    params = {
+        "category": "spot",
+        "symbol": symbol,
+        "interval": interval,
+        "start": start_time,
+        "end": end_time
+    }
+
+    status_code, candles = fetch_candles(params)
+    if status_code != 200:
+        print(f"Ошибка: Невозможно получить данные свечей с Bybit. Код статуса: {status_code}")
+        return None, None, None, None
+
+    if not candles:
+        print("Данные дневных свечей отсутствуют для анализа диапазона цен.")
+        return None, None, None, None
+
+    # Ищем пиковую и наименьшую цены
+    peak_price = max(candles, key=lambda x: float(x[4]))  # Цена закрытия
+    lowest_price = min(candles, key=lambda x: float(x[4]))
+
+    # Извлекаем значения цен и дат
+    peak_price_value = float(peak_price[4])
+    peak_price_date = datetime.fromtimestamp(int(peak_price[0]) / 1000, tz=timezone.utc)
+
+    lowest_price_value = float(lowest_price[4])
+    lowest_price_date = datetime.fromtimestamp(int(lowest_price[0]) / 1000, tz=timezone.utc)
+
+    return peak_price_value, peak_price_date, lowest_price_value, lowest_price_date
+
+
+def get_eth_peak_and_low_on_date(eth_symbol, target_date_timestamp):
+    """
+    Получает пиковую и минимальную цены ETH в указанный день.
+
+    :param eth_symbol: Символ пары ETH (например, "ETHUSDT").
+    :param target_date_timestamp: Временная метка начала дня в миллисекундах.
+    :return: Пиковая и минимальная цены ETH.
+    """
+    interval = "D"  # Используем 15-минутные свечи
+    end_time = target_date_timestamp + 86400000  # Конец дня (1 день в миллисекундах)
+
+    params = {
+        "category": "spot",
+        "symbol": eth_symbol,
+        "interval": interval,
+        "start": target_date_timestamp,
+        "end": end_time
+    }
+
+    status_code, candles = fetch_candles(params)
+    if status_code != 200:
+        print(f"Ошибка: Невозможно получить данные свечей ETH с Bybit. Код статуса: {status_code}")
+        return None, None
+
+    if not candles:
+        print("Данные 15-минутных свечей для ETH отсутствуют.")
+        return None, None
+
+    # Ищем пиковую и минимальную цены ETH
+    high_prices = [float(candle[3]) for candle in candles]  # Максимальные цены
+    low_prices = [float(candle[4]) for candle in candles]  # Минимальные цены
+
+    peak_eth_price = max(high_prices) if high_prices else None
+    lowest_eth_price = min(low_prices) if low_prices else None
+
+    return int(peak_eth_price), int(lowest_eth_price)
+
+def calculate_ratio(eth_change, token_change):
+    """
+    Вычисляет отношение первого числа ко второму по указанному принципу.
+    
+    1. Делит числа на 100.
+    2. Если число положительное, прибавляет 1.
+    3. Если число отрицательное, вычитает из 1.
+    4. Делит первое число на второе.
+    
+    :param eth_change: Первое число (проценты).
+    :param token_change: Второе число (проценты).
+    :return: Отношение двух чисел или "-" при ошибке.
+    """
+    try:
+        # Деление на 100
+        factor1 = eth_change / 100
+        factor2 = token_change / 100
+
+        # Преобразование по правилам
+        if factor1 >= 0:
+            factor1 = 1 + factor1
+        else:
+            factor1 = 1 - abs(factor1)
+
+        if factor2 >= 0:
+            factor2 = 1 + factor2
+        else:
+            factor2 = 1 - abs(factor2)
+
+        # Деление и возврат результата
+        return round(factor1 / factor2, 2)
+    except (TypeError, ZeroDivisionError):
+        return "-"
+
+def read_symbols_from_xls(file_path):
+    """
+    Читает список монет из Excel файла.
+    
+    :param file_path: Путь к .xls файлу
+    :return: Список символов монет
+    """
+    import xlrd
+
+    symbols = []
+    workbook = xlrd.open_workbook(file_path)
+    sheet = workbook.sheet_by_index(0)
+    for row_idx in range(sheet.nrows):
+        symbol = sheet.cell_value(row_idx, 0).strip().upper()
+        if symbol.endswith("USDT"):
+            symbols.append(symbol)
+    return symbols
+
+def save_results_to_csv(data, output_file):
+    """
+    Сохраняет результаты в CSV файл.
+    
+    :param data: Данные для записи (список списков)
+    :param output_file: Путь к выходному CSV файлу
+    """
+    with open(output_file, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADERS)
+        writer.writerows(data)
+
+def main(input_file="inputs Bybit.xls", output_name="output Bybit", metrics_file="metrics.db",
+         live_feed=False, output_format=DEFAULT_FORMAT, trace_file=None, profile_dir=None,
+         listing_file="metrics.db"):
+    """
+    :param input_file: Входной Excel файл
+    :param output_name: Выходной файл без расширения
+    :param metrics_file: Таблица метрик
+    :param listing_file: Индекс дат листинга (listing_index.py); None — не использовать
+    """
+    global price_feed, listing_index
+    output_file = output_path(output_name, output_format)  # Выходной файл
+
+    # Чтение символов из Excel файла
+    symbols = read_symbols_from_xls(input_file)
+    if not symbols:
+        print("Файл ввода пуст или не содержит символов.")
+        return
+
+    if trace_file:
+        tracing.enable(profile_dir)
+
+    # Индекс, созданный здесь, закрывается по завершении; подписка заменяется только на время запуска
+    own_index = bool(listing_file) and listing_index is None
+    if own_index:
+        listing_index = ListingIndex(listing_file)
+    previous_feed = price_feed
+
+    all_results = []
+    all_metrics = []
+    symbol_metrics = []  # Метрики по всем символам, включая None для необработанных
+    try:
+        if live_feed:
+            # Текущие цены берём из WebSocket вместо запроса на каждый символ
+            from .price_feed import PriceFeed
+            price_feed = PriceFeed("bybit", symbols + ["ETHUSDT"]).start()
+            if not price_feed.wait(timeout=15):
+                print("Не по всем символам получены цены из WebSocket, недостающие будут запрошены через REST.")
+
+        for symbol in symbols:
+            print(f"Обработка {symbol}...")
+            with symbol_scope(symbol):
+                metrics = fetch_symbol_metrics(symbol)
+                with span("compute"):
+                    all_results.append(build_symbol_row(symbol, metrics))
+            symbol_metrics.append(metrics)
+            if metrics is not None:
+                all_metrics.append(metrics)
+    finally:
+        if price_feed is not previous_feed:
+            price_feed.stop()
+        price_feed = previous_feed
+        if own_index:
+            listing_index.close()
+            listing_index = None
+
+    with span("output"):
+        # Сохранение результатов: числовые колонки (Parquet/Arrow) или отформатированная таблица (XLS/CSV)
+        write_result(ResultTable.from_metrics("bybit", symbol_metrics, HEADERS, all_results, symbols), output_file, output_format)
+
+        # Сохранение числовых метрик для быстрых выборок (metrics_store.py)
+        save_metrics(metrics_file, "bybit", all_metrics)
+
+    if trace_file:
+        tracing.get_tracer().export(trace_file)
+
+def _number_or_none(value):
+    """
+    Приводит прочерк "-" к None, чтобы метрики оставались числовыми.
+    """
+    return None if value == "-" else value
+
+def fetch_symbol_metrics(symbol, include_eth=True):
+    """
+    Собирает числовые метрики монеты без форматирования.
+
+    :param symbol: Торговая пара (например, "BTCUSDT")
+    :param include_eth: Запрашивать цены ETH; False — поля eth_* остаются None (их заполняет вызывающий)
+    :return: Словарь метрик (см. metrics_store.METRIC_FIELDS) или None, если листинг не найден
+    """
+    with span("listing"):
+        listing_timestamp, price_listing = get_listing(symbol)
+        if listing_timestamp is None:
+            return None
+
+    with span("history"):
+        price_90_days = get_price_after_days(symbol, listing_timestamp, 90)
+        price_180_days = get_price_after_days(symbol, listing_timestamp, 180)
+        current_price = get_current_price(symbol)
+        peak_price, peak_date, lowest_price, lowest_date = get_peak_and_lowest_price(symbol, listing_timestamp)
+
+    eth_price_listing = eth_price_90_days = eth_price_180_days = eth_current_price = None
+    eth_peak_price = eth_low_price = None
+    if include_eth:
+        with span("eth"):
+            eth_price_listing = get_price_after_days("ETHUSDT", listing_timestamp, 0)
+            eth_price_90_days = get_price_after_days("ETHUSDT", listing_timestamp, 90)
+            eth_price_180_days = get_price_after_days("ETHUSDT", listing_timestamp, 180)
+            eth_current_price = get_current_price("ETHUSDT")
+
+            eth_peak_price, _ = get_eth_peak_and_low_on_date("ETHUSDT", int(peak_date.timestamp() * 1000)) if peak_date else (None, None)
+            eth_low_price, _ = get_eth_peak_and_low_on_date("ETHUSDT", int(lowest_date.timestamp() * 1000)) if lowest_date else (None, None)
+
+    return {
+        "symbol": symbol,
+        "listing_ts": listing_timestamp,
+        "listing_price": price_listing,
+        "price_90d": _number_or_none(price_90_days),
+        "price_180d": _number_or_none(price_180_days),
+        "current_price": current_price,
+        "eth_listing_price": _number_or_none(eth_price_listing),
+        "eth_price_90d": _number_or_none(eth_price_90_days),
+        "eth_price_180d": _number_or_none(eth_price_180_days),
+        "eth_current_price": eth_current_price,
+        "peak_price": peak_price,
+        "peak_ts": int(peak_date.timestamp() * 1000) if peak_date else None,
+        "lowest_price": lowest_price,
+        "lowest_ts": int(lowest_date.timestamp() * 1000) if lowest_date else None,
+        "eth_at_peak": eth_peak_price,
+        "eth_at_lowest": eth_low_price,
+    }
+
+def build_symbol_row(symbol, metrics):
+    """
+    Формирует строку таблицы из метрик, полученных fetch_symbol_metrics.
+    """
+    if metrics is None:
+        return [symbol, "-", "-", "-", "-", "-", "-", "-", "-", "-", "-", "-", "-", "-", "-", "-", "-", "-"]
+
+    listing_date = datetime.fromtimestamp(metrics["listing_ts"] / 1000, tz=timezone.utc)
+    price_listing = metrics["listing_price"]
+    # Отсутствующие значения в таблице по-прежнему отображаются прочерком
+    price_90_days = "-" if metrics["price_90d"] is None else metrics["price_90d"]
+    price_180_days = "-" if metrics["price_180d"] is None else metrics["price_180d"]
+    current_price = metrics["current_price"]
+    eth_price_listing = "-" if metrics["eth_listing_price"] is None else metrics["eth_listing_price"]
+    eth_price_90_days = "-" if metrics["eth_price_90d"] is None else metrics["eth_price_90d"]
+    eth_price_180_days = "-" if metrics["eth_price_180d"] is None else metrics["eth_price_180d"]
+    eth_current_price = metrics["eth_current_price"]
+    peak_price = metrics["peak_price"]
+    lowest_price = metrics["lowest_price"]
+    eth_peak_price = metrics["eth_at_peak"]
+    eth_low_price = metrics["eth_at_lowest"]
+
+    ratio_at_peak = calculate_ratio(calculate_change(eth_peak_price, eth_price_listing), calculate_change(peak_price, price_listing))
+    ratio_at_low = calculate_ratio(calculate_change(eth_low_price, eth_price_listing), calculate_change(lowest_price, price_listing))
+    ratio_current = calculate_ratio(calculate_change(eth_current_price, eth_price_listing), calculate_change(current_price, price_listing))
+    ratio_90_days = calculate_ratio(calculate_change(eth_price_90_days, eth_price_listing), calculate_change(price_90_days, price_listing))
+    ratio_180_days = calculate_ratio(calculate_change(eth_price_180_days, eth_price_listing), calculate_change(price_180_days, price_listing))
+
+    formatted_listing_date = listing_date.strftime('%d.%m.%Y') if listing_date else "-"
+    formatted_price_listing = price_listing
+    formatted_price_90_days = format_price_with_change(price_90_days, calculate_change(price_90_days, price_listing))
+    formatted_price_180_days = format_price_with_change(price_180_days, calculate_change(price_180_days, price_listing))
+    formatted_current_price = format_price_with_change(current_price, calculate_change(current_price, price_listing))
+    formatted_eth_price_listing = int(eth_price_listing)
+    formatted_eth_price_90_days = format_price_with_change(eth_price_90_days, calculate_change(eth_price_90_days, eth_price_listing))
+    formatted_eth_price_180_days = format_price_with_change(eth_price_180_days, calculate_change(eth_price_180_days, eth_price_listing))
+    formatted_eth_current_price = format_price_with_change(eth_current_price, calculate_change(eth_current_price, eth_price_listing))
+    formatted_peak_price = format_price_with_change(peak_price, calculate_change(peak_price, price_listing))
+    formatted_lowest_price = format_price_with_change(lowest_price, calculate_change(lowest_price, price_listing))
+
+    return [
+        symbol, formatted_listing_date, formatted_price_listing, formatted_price_90_days,
+        formatted_price_180_days, formatted_current_price, formatted_eth_price_listing,
+        formatted_eth_price_90_days, formatted_eth_price_180_days, formatted_eth_current_price,
+        formatted_peak_price, formatted_lowest_price, eth_peak_price, eth_low_price,
+        ratio_at_peak, ratio_at_low, ratio_current, ratio_90_days, ratio_180_days
+    ]
+
+def process_symbol(symbol):
+    """
+    Обрабатывает один символ и возвращает данные для вывода в таблицу.
+    """
+    return build_symbol_row(symbol, fetch_symbol_metrics(symbol))
@@ -0,0 +1,157 @@
+"""
+Единая точка входа: retrodrops <команда> [параметры].
+
+Модули команд и их зависимости (requests, xlwt, xlrd, openpyxl, pyarrow)
+импортируются только при запуске соответствующей команды.
+"""
+import argparse
+import sys
+
+# Команды, которые разбирают свои параметры сами
+PASSTHROUGH_COMMANDS = {"screen", "serve"}
+
+
+def _check_format(parser, fmt):
+    from .result_table import WRITERS
+
+    if fmt not in WRITERS:
+        parser.error(f"неизвестный формат {fmt!r}, доступны: {', '.join(sorted(WRITERS))}")
+
+
+def _collect_binance(parser, args):
+    _check_format(parser, args.format)
+    from . import binance_collector
+
+    binance_collector.main(input_file=args.input, output_name=args.output, metrics_file=args.metrics_db,
+                           live_feed=args.live, output_format=args.format,
+                           trace_file=args.trace, profile_dir=args.profile_dir, listing_file=args.listing_db)
+
+
+def _collect_bybit(parser, args):
+    _check_format(parser, args.format)
+    from . import bybit_collector
+
+    bybit_collector.main(input_file=args.input, output_name=args.output, metrics_file=args.metrics_db,
+                         live_feed=args.live, output_format=args.format,
+                         trace_file=args.trace, profile_dir=args.profile_dir, listing_file=args.listing_db)
+
+
+def _collect_all(parser, args):
+    _check_format(parser, args.format)
+    from . import combined_run
+
+    combined_run.main(binance_input=args.binance_input, bybit_input=args.bybit_input, output_name=args.output,
+                      metrics_file=args.metrics_db, listing_file=args.listing_db, live_feed=args.live,
+                      output_format=args.format, trace_file=args.trace, profile_dir=args.profile_dir)
+
+
+def _eth_at_date(parser, args):
+    if bool(args.input) != bool(args.output):
+        parser.error("--input и --output указываются вместе")
+    if not args.date and not args.input:
+        parser.error("укажите --date или --input и --output")
+    from . import eth_at_date
+
+    for date_str in args.date:
+        print(f"{date_str}: {eth_at_date.get_eth_price_at_date(date_str)}")
+    if args.input:
+        eth_at_date.process_csv_to_excel(args.input, args.output)
+
+
+def _ratio(parser, args):
+    from . import ratio_calculator
+
+    if args.stream:
+        if args.chunk_rows < 1:
+            parser.error("--chunk-rows должен быть не меньше 1")
+        if args.workers < 1:
+            parser.error("--workers должен быть не меньше 1")
+        ratio_calculator.calculate_ratio_stream(args.input, args.output or "output.parquet",
+                                                args.ratio_output or "ratio.parquet",
+                                                chunk_rows=args.chunk_rows, workers=args.workers)
+    else:
+        ratio_calculator.calculate_percentage_difference_from_csv(args.input, args.output or "output.xls",
+                                                                  args.ratio_output or "ratio.xls")
+
+
+def _screen(parser, args, extra):
+    from . import metrics_store
+
+    return metrics_store.main(extra, prog=parser.prog)
+
+
+def _serve(parser, args, extra):
+    from . import collector_service
+
+    return collector_service.main(extra, prog=parser.prog)
+
+
+def _add_collector_arguments(parser, default_input, default_output):
+    parser.add_argument("--input", default=default_input, help="Файл со списком символов")
+    _add_output_arguments(parser, default_output)
+
+
+def _add_output_arguments(parser, default_output):
+    parser.add_argument("--output", default=default_output, help="Выходной файл без расширения")
+    parser.add_argument("--metrics-db", default="metrics.db", help="Таблица метрик")
+    parser.add_argument("--listing-db", default="metrics.db", help="Постоянный индекс дат листинга")
+    parser.add_argument("--format", default="parquet", help="parquet, arrow, csv или xls")
+    parser.add_argument("--live", action="store_true", help="Текущие цены из WebSocket")
+    parser.add_argument("--trace", help="Сохранить трассировку этапов (Chrome trace JSON)")
+    parser.add_argument("--profile-dir", help="Сохранить профили cProfile по этапам (вместе с --trace)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="retrodrops", description="Инструменты сбора и анализа цен после листинга.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("collect-binance", help="Сбор цен с Binance")
+    _add_collector_arguments(command, "input.csv", "ticker_data")
+    command.set_defaults(handler=_collect_binance, command_parser=command)
+
+    command = commands.add_parser("collect-bybit", help="Сбор цен с Bybit")
+    _add_collector_arguments(command, "inputs Bybit.xls", "output Bybit")
+    command.set_defaults(handler=_collect_bybit, command_parser=command)
+
+    command = commands.add_parser("collect-all", help="Совместный сбор с Binance и Bybit в одну таблицу")
+    command.add_argument("--binance-input", default="input.csv", help="Список символов для Binance (CSV)")
+    command.add_argument("--bybit-input", default="inputs Bybit.xls", help="Список символов для Bybit (XLS)")
+    _add_output_arguments(command, "combined")
+    command.set_defaults(handler=_collect_all, command_parser=command)
+
+    command = commands.add_parser("eth-at-date", help="Цена ETH на даты")
+    command.add_argument("--date", action="append", default=[], help="Дата ДД.ММ.ГГГГ (можно несколько)")
+    command.add_argument("--input", help="Входной .csv файл с датами")
+    command.add_argument("--output", help="Выходной .xlsx файл с ценами")
+    command.set_defaults(handler=_eth_at_date, command_parser=command)
+
+    command = commands.add_parser("ratio", help="Процентные отличия и изменения (Ratio Calculator)")
+    command.add_argument("--input", default="input.csv", help="Входной CSV (разделитель ;)")
+    command.add_argument("--output", help="По умолчанию output.xls (output.parquet с --stream)")
+    command.add_argument("--ratio-output", help="По умолчанию ratio.xls (ratio.parquet с --stream)")
+    command.add_argument("--stream", action="store_true", help="Потоковая обработка больших файлов блоками")
+    command.add_argument("--chunk-rows", type=int, default=100000, help="Строк в блоке (с --stream)")
+    command.add_argument("--workers", type=int, default=1, help="Число процессов (с --stream)")
+    command.set_defaults(handler=_ratio, command_parser=command)
+
+    command = commands.add_parser("screen", add_help=False, help="Выборка из таблицы метрик (--help для параметров)")
+    command.set_defaults(handler=_screen, command_parser=command)
+
+    command = commands.add_parser("serve", add_help=False, help="Сервис с HTTP API (--help для параметров)")
+    command.set_defaults(handler=_serve, command_parser=command)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command in PASSTHROUGH_COMMANDS:
+        return args.handler(args.command_parser, args, extra) or 0
+    if extra:
+        args.command_parser.error(f"нераспознанные параметры: {' '.join(extra)}")
+    return args.handler(args.command_parser, args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from . import bybit_collector, ratio_calculator
+from .exchanges import ADAPTERS, get_adapter
+from .eth_series import EthSeries
+from .listing_index import ListingIndex
+from .metrics_store import derive_metrics, save_metrics
+
+
+class CollectorService:
+    """
+    Держит в памяти сборщики (с их пулами соединений и кэшем свечей), историю ETH
+    и последние результаты, периодически обновляя их.
+    """
+
+    def __init__(self, exchanges=("binance", "bybit"), interval=3600, metrics_db="metrics.db",
+                 binance_input="input.csv", bybit_input="inputs Bybit.xls", live_feed=False, pause=1.0,
+                 listing_db="metrics.db"):
+        """
+        :param exchanges: Биржи, результаты по которым обновляются
+        :param interval: Период обновления, сек
+        :param metrics_db: База метрик (metrics_store.py); None — не сохранять
+        :param binance_input: Список символов для Binance (CSV)
+        :param bybit_input: Список символов для Bybit (XLS)
+        :param live_feed: Брать текущие цены из WebSocket (price_feed.py)
+        :param pause: Пауза между символами, сек
+        :param listing_db: Индекс дат листинга (listing_index.py), общий для бирж; None — не использовать
+        """
+        self.exchanges = list(exchanges)
+        self.interval = interval
+        self.metrics_db = metrics_db
+        self.inputs = {"binance": binance_input, "bybit": bybit_input}
+        self.live_feed = live_feed
+        self.pause = pause
+
+        self.adapters = {name: get_adapter(name) for name in ADAPTERS}
+        self.ratio = ratio_calculator
+        self.eth_series = EthSeries(bybit_collector)
+        # Прежние подписки и индекс модулей сборщиков возвращаются в stop()
+        self._previous = {name: adapter.save_state() for name, adapter in self.adapters.items()}
+        self._feeds = {}
+        self.listing_index = ListingIndex(listing_db) if listing_db else None
+        if self.listing_index is not None:
+            for adapter in self.adapters.values():
+                adapter.listing_index = self.listing_index
+
+        self.results = {}
+        # Последняя ошибка по бирже: {биржа: {"ts": ..., "symbol": ..., "error": ...}}
+        self.last_errors = {}
+        self._lock = threading.Lock()
+        self._refresh_now = threading.Event()
+        self._stopped = threading.Event()
+
+    def _ensure_feed(self, exchange, symbols):
+        adapter = self.adapters[exchange]
+        wanted = sorted(set(symbols) | {"ETHUSDT"})
+        feed = self._feeds.get(exchange)
+        if feed is not None and feed.symbols == wanted:
+            return
+        from .price_feed import PriceFeed
+        if feed is not None:
+            feed.stop()
+        self._feeds[exchange] = adapter.price_feed = PriceFeed(exchange, wanted).start()
+        adapter.price_feed.wait(timeout=15)
+
+    def refresh_exchange(self, exchange):
+        """
+        Пересчитывает результаты по всем символам биржи.
+        """
+        adapter = self.adapters[exchange]
+        symbols = adapter.read_symbols(self.inputs[exchange])
+        if not symbols:
+            print(f"Список символов для {exchange} пуст.")
+            return
+        if self.live_feed:
+            self._ensure_feed(exchange, symbols)
+
+        rows = []
+        all_metrics = []
+        for symbol in symbols:
+            if self._stopped.is_set():
+                return
+            try:
+                metrics = adapter.fetch_metrics(symbol)
+                row = adapter.build_row(symbol, metrics)
+            except Exception as e:
+                # Ошибка по одному символу не должна останавливать обновление всей биржи
+                print(f"Ошибка при обработке {symbol} ({exchange}): {e}")
+                self._record_error(exchange, e, symbol)
+                metrics = None
+                row = adapter.build_row(symbol, None)
+            rows.append({
+                "symbol": symbol,
+                "row": row,
+                "metrics": derive_metrics(metrics) if metrics is not None else None,
+            })
+            if metrics is not None:
+                all_metrics.append(metrics)
+            time.sleep(self.pause)
+
+        with self._lock:
+            self.results[exchange] = {"updated": int(time.time() * 1000), "rows": rows}
+        if self.metrics_db:
+            save_metrics(self.metrics_db, exchange, all_metrics)
+
+    def refresh(self):
+        """
+        Обновляет историю ETH и результаты по всем биржам.
+        """
+        try:
+            self.eth_series.refresh()
+        except Exception as e:
+            print(f"Ошибка обновления истории ETH: {e}")
+        for exchange in self.exchanges:
+            if self._stopped.is_set():
+                return
+            try:
+                self.refresh_exchange(exchange)
+            except Exception as e:
+                print(f"Ошибка обновления {exchange}: {e}")
+                self._record_error(exchange, e)
+
+    def _record_error(self, exchange, error, symbol=None):
+        with self._lock:
+            self.last_errors[exchange] = {"ts": int(time.time() * 1000), "symbol": symbol, "error": str(error)}
+
+    def run_scheduler(self):
+        while not self._stopped.is_set():
+            started = time.time()
+            self.refresh()
+            print(f"Обновление завершено за {time.time() - started:.1f} с")
+            self._refresh_now.wait(self.interval)
+            self._refresh_now.clear()
+
+    def request_refresh(self):
+        self._refresh_now.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._refresh_now.set()
+        for feed in self._feeds.values():
+            feed.stop()
+        self._feeds = {}
+        for name, adapter in self.adapters.items():
+            adapter.restore_state(self._previous[name])
+        if self.listing_index is not None:
+            self.listing_index.close()
+            self.listing_index = None
+
+    def status(self):
+        with self._lock:
+            updated = {e: r["updated"] for e, r in self.results.items()}
+            errors = dict(self.last_errors)
+        return {"exchanges": updated, "errors": errors, "eth_series_updated": self.eth_series.updated}
+
+    def latest_rows(self, exchange, symbol=None):
+        with self._lock:
+            result = self.results.get(exchange)
+        if result is None:
+            return None
+        rows = result["rows"]
+        if symbol:
+            rows = [r for r in rows if r["symbol"] == symbol.upper()]
+        return {"updated": result["updated"], "rows": rows}
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    Локальный HTTP API:
+
+        GET  /health                          — состояние сервиса
+        GET  /rows?exchange=binance[&symbol=] — последние результаты
+        GET  /eth?date=ДД.ММ.ГГГГ[&date=...]  — цена ETH на дату
+        GET  /ratio?base=10&values=12;8,5     — расчёт как в Ratio Calculator
+        POST /refresh                         — внеочередное обновление
+    """
+
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        try:
+            if parsed.path == "/health":
+                self._send_json(200, self.service.status())
+            elif parsed.path == "/rows":
+                exchange = query.get("exchange", ["binance"])[0]
+                result = self.service.latest_rows(exchange, query.get("symbol", [None])[0])
+                if result is None:
+                    self._send_json(404, {"error": f"Нет результатов для {exchange}"})
+                else:
+                    self._send_json(200, result)
+            elif parsed.path == "/eth":
+                dates = query.get("date", [])
+                self._send_json(200, {d: self.service.eth_series.price_at_date(d) for d in dates})
+            elif parsed.path == "/ratio":
+                base_number = float(query["base"][0].replace(',', '.'))
+                if base_number == 0:
+                    raise ValueError("опорное значение равно 0")
+                values = [float(v.replace(',', '.')) for v in query["values"][0].split(';') if v]
+                results = self.service.ratio.calculate_ratio_row(base_number, values)
+                self._send_json(200, [
+                    {"value": v, "change_percent": p, "ratio": r} for v, p, r in results
+                ])
+            else:
+                self._send_json(404, {"error": "Неизвестный путь"})
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"Некорректный запрос: {e}"})
+
+    def do_POST(self):
+        if urlparse(self.path).path == "/refresh":
+            self.service.request_refresh()
+            self._send_json(202, {"status": "refresh scheduled"})
+        else:
+            self._send_json(404, {"error": "Неизвестный путь"})
+
+
+def main(argv=None, prog=None):
+    """
+    :param argv: Параметры командной строки (по умолчанию sys.argv[1:])
+    :param prog: Имя программы в справке (например, "retrodrops serve")
+    """
+    parser = argparse.ArgumentParser(prog=prog, description="Сервис сбора цен с периодическим обновлением и HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=int, default=3600, help="Период обновления, сек")
+    parser.add_argument("--exchanges", default="binance,bybit", help="Биржи через запятую")
+    parser.add_argument("--binance-input", default="input.csv")
+    parser.add_argument("--bybit-input", default="inputs Bybit.xls")
+    parser.add_argument("--metrics-db", default="metrics.db")
+    parser.add_argument("--listing-db", default="metrics.db", help="Индекс дат листинга")
+    parser.add_argument("--pause", type=float, default=1.0, help="Пауза между символами, сек")
+    parser.add_argument("--live", action="store_true", help="Текущие цены из WebSocket")
+    args = parser.parse_args(argv)
+
+    service = CollectorService(
+        exchanges=[e.strip() for e in args.exchanges.split(",") if e.strip()],
+        interval=args.interval,
+        metrics_db=args.metrics_db,
+        binance_input=args.binance_input,
+        bybit_input=args.bybit_input,
+        live_feed=args.live,
+        pause=args.pause,
+        listing_db=args.listing_db,
+    )
+    ServiceHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+
+    threading.Thread(target=service.run_scheduler, daemon=True).start()
+    print(f"Сервис запущен на http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from . import bybit_collector, tracing
+from .eth_series import EthSeries
+from .exchanges import get_adapter
+from .listing_index import ListingIndex
+from .metrics_store import change_percent, derive_metrics, save_metrics
+from .result_table import DEFAULT_FORMAT, ResultTable, output_path, write_result
+from .tracing import span, symbol_scope
+
+EXCHANGES = ["binance", "bybit"]
+
+# Метрики каждой биржи в общей таблице: (поле, заголовок, вид значения); колонки — <биржа>_<поле>
+EXCHANGE_FIELDS = [
+    ("listing_ts", "Listing Date", "date"),
+    ("listing_price", "Listing Price", "price"),
+    ("current_price", "Current Price", "price"),
+    ("change_90d", "Change 90 Days", "percent"),
+    ("change_180d", "Change 180 Days", "percent"),
+    ("change_current", "Change Current", "percent"),
+    ("rel_90d", "Rel Change 90 Days", "ratio"),
+    ("rel_180d", "Rel Change 180 Days", "ratio"),
+    ("rel_current", "Rel Change Current", "ratio"),
+    ("peak_change", "Peak Change", "percent"),
+    ("lowest_change", "Lowest Change", "percent"),
+]
+
+# Сравнение бирж: разница дат листинга (Bybit − Binance) и расхождение текущих цен
+COMPARE_FIELDS = [
+    ("listing_gap_days", "Listing Gap (days)", "ratio"),
+    ("current_spread", "Current Price Spread", "percent"),
+]
+
+
+class EthBenchmark:
+    """
+    Общий для всех бирж ряд цен ETH: дневные закрытия ETHUSDT загружаются один раз,
+    и метрики обеих бирж считаются относительно одних и тех же цен.
+    """
+
+    def __init__(self, series, current_price):
+        """
+        :param series: Загруженный eth_series.EthSeries
+        :param current_price: Текущая цена ETH
+        """
+        self.series = series
+        self.current_price = current_price
+
+    def close(self, timestamp, adapter):
+        """
+        Цена закрытия ETH за день метки времени; дни вне ряда запрашиваются у биржи.
+        """
+        price = self.series.close_at(timestamp)
+        if price is None and timestamp + 86400000 < time.time() * 1000:
+            price = adapter.eth_close(timestamp - timestamp % 86400000)
+        return price
+
+    def fill(self, metrics, adapter):
+        """
+        Заполняет поля eth_* метрик, собранных с include_eth=False.
+        """
+        listing_ts = metrics["listing_ts"]
+        metrics["eth_listing_price"] = self.close(listing_ts, adapter)
+        metrics["eth_price_90d"] = self.close(listing_ts + 90 * 86400000, adapter)
+        metrics["eth_price_180d"] = self.close(listing_ts + 180 * 86400000, adapter)
+        metrics["eth_current_price"] = self.current_price
+        metrics["eth_at_peak"] = self.close(metrics["peak_ts"], adapter) if metrics["peak_ts"] else None
+        metrics["eth_at_lowest"] = self.close(metrics["lowest_ts"], adapter) if metrics["lowest_ts"] else None
+
+
+def collect_exchange(adapter, symbols, benchmark):
+    """
+    Собирает метрики символов одной биржи (выполняется в отдельном потоке на биржу).
+
+    :return: Словарь {символ: метрики или None}; ошибка по символу не прерывает сбор
+    """
+    results = {}
+    for symbol in symbols:
+        print(f"[{adapter.name}] Обработка {symbol}...")
+        try:
+            with symbol_scope(symbol):
+                metrics = adapter.fetch_metrics(symbol, include_eth=False)
+                if metrics is not None:
+                    with span("eth"):
+                        benchmark.fill(metrics, adapter)
+        except Exception as e:
+            print(f"[{adapter.name}] Ошибка при обработке {symbol}: {e}")
+            metrics = None
+        results[symbol] = metrics
+        time.sleep(adapter.pause)
+    return results
+
+
+def _format_value(value, kind):
+    if value is None:
+        return "-"
+    if kind == "date":
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).strftime("%d.%m.%Y")
+    if kind == "percent":
+        return f"{value:+.0f}%"
+    if kind == "ratio":
+        return round(value, 2)
+    return round(value, 4)
+
+
+def build_combined_table(symbols, results):
+    """
+    Сводит метрики бирж в одну таблицу: строка на символ, колонки бирж рядом.
+
+    :param symbols: Символы в порядке вывода
+    :param results: {биржа: {символ: метрики или None}}
+    :return: result_table.ResultTable
+    """
+    columns = {"symbol": []}
+    types = {}
+    headers = ["Symbol"]
+    for exchange in EXCHANGES:
+        for field, header, kind in EXCHANGE_FIELDS:
+            columns[f"{exchange}_{field}"] = []
+            types[f"{exchange}_{field}"] = "timestamp" if kind == "date" else "float"
+            headers.append(f"{exchange.capitalize()} {header}")
+    for field, header, _ in COMPARE_FIELDS:
+        columns[field] = []
+        headers.append(header)
+
+    rows = []
+    for symbol in symbols:
+        derived = {}
+        for exchange in EXCHANGES:
+            metrics = results.get(exchange, {}).get(symbol)
+            derived[exchange] = derive_metrics(metrics) if metrics is not None else {}
+
+        binance, bybit = derived["binance"], derived["bybit"]
+        compare = {"listing_gap_days": None, "current_spread": None}
+        if binance.get("listing_ts") is not None and bybit.get("listing_ts") is not None:
+            compare["listing_gap_days"] = (bybit["listing_ts"] - binance["listing_ts"]) / 86400000
+        compare["current_spread"] = change_percent(bybit.get("current_price"), binance.get("current_price"))
+
+        row = [symbol]
+        columns["symbol"].append(symbol)
+        for exchange in EXCHANGES:
+            for field, _, kind in EXCHANGE_FIELDS:
+                value = derived[exchange].get(field)
+                if value is not None and kind != "date":
+                    value = float(value)
+                columns[f"{exchange}_{field}"].append(value)
+                row.append(_format_value(value, kind))
+        for field, _, kind in COMPARE_FIELDS:
+            columns[field].append(compare[field])
+            row.append(_format_value(compare[field], kind))
+        rows.append(row)
+
+    return ResultTable(columns, headers, rows, types)
+
+
+def main(binance_input="input.csv", bybit_input="inputs Bybit.xls", output_name="combined",
+         metrics_file="metrics.db", listing_file="metrics.db", live_feed=False,
+         output_format=DEFAULT_FORMAT, trace_file=None, profile_dir=None):
+    """
+    Совместный запуск: обе биржи опрашиваются одновременно (поток на биржу) с общими
+    индексом листингов и рядом цен ETH, результат — одна таблица с колонками бирж рядом.
+
+    :param binance_input: Список символов для Binance (CSV)
+    :param bybit_input: Список символов для Bybit (XLS)
+    :param output_name: Выходной файл без расширения
+    :param metrics_file: Таблица метрик (metrics_store.py); None — не сохранять
+    :param listing_file: Индекс дат листинга (listing_index.py); None — не использовать
+    """
+    started = time.time()
+    adapters = {exchange: get_adapter(exchange) for exchange in EXCHANGES}
+    inputs = {"binance": binance_input, "bybit": bybit_input}
+    symbol_lists = {exchange: adapter.read_symbols(inputs[exchange]) for exchange, adapter in adapters.items()}
+    symbols = list(dict.fromkeys(s for exchange in EXCHANGES for s in symbol_lists[exchange]))
+    if not symbols:
+        print("Списки символов пусты. Проверьте входные файлы.")
+        return
+
+    if trace_file:
+        tracing.enable(profile_dir)
+
+    # Подписка и индекс живут в модулях сборщиков: после запуска возвращаем прежние
+    previous = {exchange: adapter.save_state() for exchange, adapter in adapters.items()}
+    listing_index = None
+    feeds = []
+    try:
+        if listing_file:
+            listing_index = ListingIndex(listing_file)
+            for adapter in adapters.values():
+                adapter.listing_index = listing_index
+
+        if live_feed:
+            # Текущие цены берём из WebSocket вместо запроса на каждый символ
+            from .price_feed import PriceFeed
+            for exchange, adapter in adapters.items():
+                adapter.price_feed = PriceFeed(exchange, symbol_lists[exchange] + ["ETHUSDT"]).start()
+                feeds.append(adapter.price_feed)
+            for adapter in adapters.values():
+                if not adapter.price_feed.wait(timeout=15):
+                    print(f"[{adapter.name}] Не по всем символам получены цены из WebSocket, "
+                          "недостающие будут запрошены через REST.")
+
+        with span("eth"):
+            series = EthSeries(bybit_collector)
+            series.refresh()
+            benchmark = EthBenchmark(series, adapters["bybit"].current_price("ETHUSDT"))
+
+        with ThreadPoolExecutor(max_workers=len(adapters)) as executor:
+            futures = {
+                exchange: executor.submit(collect_exchange, adapter, symbol_lists[exchange], benchmark)
+                for exchange, adapter in adapters.items()
+            }
+            results = {exchange: future.result() for exchange, future in futures.items()}
+    finally:
+        for feed in feeds:
+            feed.stop()
+        for exchange, adapter in adapters.items():
+            adapter.restore_state(previous[exchange])
+        if listing_index is not None:
+            listing_index.close()
+
+    with span("output"):
+        output_file = output_path(output_name, output_format)
+        write_result(build_combined_table(symbols, results), output_file, output_format)
+        if metrics_file:
+            for exchange in EXCHANGES:
+                all_metrics = [m for m in results[exchange].values() if m is not None]
+                save_metrics(metrics_file, exchange, all_metrics)
+
+    if trace_file:
+        tracing.get_tracer().export(trace_file)
+    print(f"Совместный запуск: {len(symbols)} символов за {time.time() - started:.1f} с")
@@ -0,0 +1,85 @@
+import csv
+import requests
+from datetime import datetime, timedelta
+
+# Пул HTTP-соединений для запросов по всем датам файла
+session = requests.Session()
+
+def get_eth_price_at_date(date_str):
+    """
+    Получает цену ETH (пара ETHUSDT) на заданную дату в формате ДД.ММ.ГГГГ.
+    
+    :param date_str: Дата в формате ДД.М.ММ.ГГГГ
+    :return: Цена закрытия ETHUSDT на заданную дату или None, если данные недоступны
+    """
+    try:
+        # Преобразуем строку даты в datetime-объект
+        date_obj = datetime.strptime(date_str, "%d.%m.%Y")
+        
+        # Рассчитаем временные метки начала и конца дня в миллисекундах
+        start_timestamp = int(date_obj.timestamp() * 1000)
+        end_timestamp = int((date_obj + timedelta(days=1)).timestamp() * 1000)
+        
+        # Параметры API
+        base_url = "https://api.bybit.com/v5/market/kline"
+        params = {
+            "category": "spot",
+            "symbol": "ETHUSDT",
+            "interval": "D",
+            "start": start_timestamp,
+            "end": end_timestamp
+        }
+
+        # Запрос к API
+        response = session.get(base_url, params=params)
+
+        if response.status_code != 200:
+            print(f"Ошибка: Невозможно получить цену ETH с Bybit. Код статуса: {response.status_code}")
+            return None
+
+        # Парсим данные
+        data = response.json()
+        candles = data.get("result", {}).get("list", [])
+
+        if candles:
+            return float(candles[0][4])  # Цена закрытия свечи
+        else:
+            return None
+
+    except ValueError:
+        print("Ошибка: Неверный формат даты. Используйте ДД.ММ.ГГГГ.")
+        return None
+
+def process_csv_to_excel(input_csv, output_excel):
+    """
+    Читает даты из .csv файла, получает цены ETH для каждой даты
+    и записывает результаты в .xlsx файл в таком же формате.
+    
+    :param input_csv: Путь к входному .csv файлу с датами
+    :param output_excel: Путь к выходному .xlsx файлу с ценами
+    """
+    try:
+        from openpyxl import Workbook
+
+        # Чтение CSV файла; короткие строки дополняются пустыми ячейками до общей ширины
+        with open(input_csv, newline='', encoding='utf-8') as csvfile:
+            rows = [row for row in csv.reader(csvfile) if row]
+        width = max((len(row) for row in rows), default=0)
+
+        # Функция для получения цены по каждой дате
+        def get_price(date):
+            date = date.strip()
+            if not date:
+                return None
+            return get_eth_price_at_date(date)
+
+        # Сохраняем результат в Excel в том же формате
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in rows:
+            sheet.append([get_price(date) for date in row + [""] * (width - len(row))])
+        workbook.save(output_excel)
+        print(f"Результаты успешно сохранены в файл: {output_excel}")
+
+    except Exception as e:
+        print(f"Ошибка обработки файла: {e}")
@@ -0,0 +1,58 @@
+import time
+from datetime import datetime, timezone
+
+
+class EthSeries:
+    """
+    Дневные цены закрытия ETHUSDT (Bybit), загружаемые целиком и обновляемые по расписанию.
+    """
+
+    def __init__(self, bybit):
+        self._bybit = bybit
+        self._closes = {}
+        self.updated = None
+
+    def refresh(self):
+        """
+        Загружает всю историю дневных свечей ETHUSDT постранично (по 1000 свечей).
+        """
+        closes = {}
+        end_time = int(datetime.now(timezone.utc).timestamp() * 1000)
+        while True:
+            params = {
+                "category": "spot",
+                "symbol": "ETHUSDT",
+                "interval": "D",
+                "start": 0,
+                "end": end_time,
+                "limit": 1000
+            }
+            status_code, candles = self._bybit.fetch_candles(params)
+            if status_code != 200:
+                print(f"Ошибка: Невозможно загрузить историю ETH с Bybit. Код статуса: {status_code}")
+                return
+            for candle in candles:
+                closes[int(candle[0])] = float(candle[4])
+            if len(candles) < 1000:
+                break
+            end_time = min(int(candle[0]) for candle in candles) - 1
+
+        self._closes = closes
+        self.updated = int(time.time() * 1000)
+
+    def price_at_date(self, date_str):
+        """
+        Цена закрытия ETH за день в формате ДД.ММ.ГГГГ.
+
+        :return: Цена или None, если данных за этот день нет
+        """
+        date_obj = datetime.strptime(date_str, "%d.%m.%Y").replace(tzinfo=timezone.utc)
+        return self.close_at(int(date_obj.timestamp() * 1000))
+
+    def close_at(self, timestamp):
+        """
+        Цена закрытия ETH за день (UTC), в который попадает метка времени в мс.
+
+        :return: Цена или None, если данных за этот день нет
+        """
+        return self._closes.get(timestamp - timestamp % 86400000)
@@ -0,0 +1,152 @@
+from abc import ABC, abstractmethod
+
+from . import binance_collector, bybit_collector
+
+
+class ExchangeAdapter(ABC):
+    """
+    Общий интерфейс сборщика биржи: чтение списка символов, метрики по символу,
+    строка отформатированной таблицы, цены ETH и общие ресурсы модуля
+    (WebSocket-подписка, индекс листингов).
+
+    Адаптер — фасад над модулем сборщика, а не самостоятельный объект: price_feed
+    и listing_index хранятся в глобальных переменных модуля, которые читают его функции.
+    Поэтому на процесс приходится по одному адаптеру на биржу (get_adapter возвращает
+    один и тот же экземпляр). Кто заменяет подписку или индекс, сохраняет прежние
+    значения (save_state) и возвращает их по завершении (restore_state); одновременно
+    CollectorService и combined_run.main в одном процессе всё равно запускать нельзя.
+    """
+
+    name = None
+    module = None
+    default_input = None
+    # Пауза между символами, сек (ограничения API биржи)
+    pause = 0.0
+
+    @property
+    def headers(self):
+        return self.module.HEADERS
+
+    @abstractmethod
+    def read_symbols(self, path=None):
+        """
+        :return: Список символов из входного файла биржи
+        """
+
+    @abstractmethod
+    def fetch_metrics(self, symbol, include_eth=True):
+        """
+        :return: Словарь метрик (metrics_store.METRIC_FIELDS) или None
+        """
+
+    @abstractmethod
+    def build_row(self, symbol, metrics):
+        """
+        :return: Строка отформатированной таблицы (HEADERS модуля)
+        """
+
+    @abstractmethod
+    def current_price(self, symbol):
+        """
+        :return: Текущая цена символа или None
+        """
+
+    @abstractmethod
+    def eth_close(self, day_timestamp):
+        """
+        Цена закрытия ETHUSDT на этой бирже за день, начинающийся в day_timestamp (мс).
+        """
+
+    @property
+    def price_feed(self):
+        return self.module.price_feed
+
+    @price_feed.setter
+    def price_feed(self, feed):
+        self.module.price_feed = feed
+
+    @property
+    def listing_index(self):
+        return self.module.listing_index
+
+    @listing_index.setter
+    def listing_index(self, index):
+        self.module.listing_index = index
+
+    def save_state(self):
+        """
+        :return: Текущие (price_feed, listing_index) модуля для restore_state
+        """
+        return self.price_feed, self.listing_index
+
+    def restore_state(self, state):
+        """
+        Возвращает модулю значения, сохранённые save_state.
+        """
+        self.price_feed, self.listing_index = state
+
+
+class BinanceAdapter(ExchangeAdapter):
+    name = "binance"
+    module = binance_collector
+    default_input = "input.csv"
+    pause = 1.0
+
+    def read_symbols(self, path=None):
+        return self.module.read_symbols_from_csv(path or self.default_input)
+
+    def fetch_metrics(self, symbol, include_eth=True):
+        return self.module.fetch_ticker_metrics(symbol, include_eth=include_eth)
+
+    def build_row(self, symbol, metrics):
+        return self.module.build_ticker_row(symbol, metrics)
+
+    def current_price(self, symbol):
+        return self.module.fetch_current_price(symbol)
+
+    def eth_close(self, day_timestamp):
+        return self.module.fetch_price("ETHUSDT", day_timestamp, day_timestamp + 86400000)
+
+
+class BybitAdapter(ExchangeAdapter):
+    name = "bybit"
+    module = bybit_collector
+    default_input = "inputs Bybit.xls"
+
+    def read_symbols(self, path=None):
+        return self.module.read_symbols_from_xls(path or self.default_input)
+
+    def fetch_metrics(self, symbol, include_eth=True):
+        return self.module.fetch_symbol_metrics(symbol, include_eth=include_eth)
+
+    def build_row(self, symbol, metrics):
+        return self.module.build_symbol_row(symbol, metrics)
+
+    def current_price(self, symbol):
+        return self.module.get_current_price(symbol)
+
+    def eth_close(self, day_timestamp):
+        return self.module._number_or_none(self.module.get_price_after_days("ETHUSDT", day_timestamp, 0))
+
+
+# Поддерживаемые биржи: {название: класс адаптера}
+ADAPTERS = {
+    "binance": BinanceAdapter,
+    "bybit": BybitAdapter,
+}
+
+
+# Созданные адаптеры: состояние общее для модуля сборщика, поэтому экземпляр на биржу один
+_instances = {}
+
+
+def get_adapter(name):
+    """
+    :param name: Название биржи ("binance", "bybit")
+    :return: Адаптер биржи (один и тот же экземпляр при повторных вызовах)
+    """
+    if name not in ADAPTERS:
+        raise ValueError(f"Неизвестная биржа: {name}")
+    if name not in _instances:
+        _instances[name] = ADAPTERS[name]()
+    return _instances[name]
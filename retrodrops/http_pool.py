@@ -0,0 +1,199 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from .tracing import current_symbol, span
+
+# Коды, при которых ответ хоста не принимается и запрос повторяется на другом хосте
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# Ограничение частоты запросов. Binance считает вес запросов по IP для всех хостов сразу,
+# поэтому такой ответ останавливает весь пул до истечения Retry-After, а запрос не повторяется
+RATE_LIMIT_STATUS_CODES = {418, 429}
+
+
+class HostPool:
+    """
+    HTTP-клиент, распределяющий запросы по нескольким равнозначным хостам API.
+
+    Хост выбирается случайно с весом, обратным его оценке (медиана задержки,
+    увеличенная за недавние ошибки). Если ответ не пришёл за заданный перцентиль
+    недавних задержек, тот же запрос дублируется на другой хост и используется
+    ответ, пришедший первым.
+
+    Ответ 418/429 блокирует весь пул: новые запросы ждут до истечения Retry-After.
+    """
+
+    def __init__(self, hosts, hedge_percentile=95, initial_hedge_delay=1.0, min_hedge_delay=0.05,
+                 timeout=10, latency_window=200, max_workers=8):
+        """
+        :param hosts: Базовые адреса, например ["https://api.binance.com", "https://api1.binance.com"]
+        :param hedge_percentile: Перцентиль задержки, после которого отправляется дубликат запроса
+        :param initial_hedge_delay: Задержка дублирования, пока статистики ещё мало, сек
+        :param min_hedge_delay: Минимальная задержка дублирования, сек
+        :param timeout: Таймаут одного запроса, сек
+        :param latency_window: Сколько последних задержек учитывать
+        :param max_workers: Число потоков для параллельных запросов
+        """
+        if not hosts:
+            raise ValueError("Список хостов пуст")
+        self.hosts = [host.rstrip("/") for host in hosts]
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.timeout = timeout
+
+        self._sessions = {host: requests.Session() for host in self.hosts}
+        self._latencies = {host: deque(maxlen=latency_window) for host in self.hosts}
+        self._recent = deque(maxlen=latency_window)
+        self._errors = {host: 0.0 for host in self.hosts}
+        self._banned_until = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "retries": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _score(self, host):
+        latencies = sorted(self._latencies[host])
+        latency = latencies[len(latencies) // 2] if latencies else 0.2
+        return latency * (1 + self._errors[host])
+
+    def ban_remaining(self):
+        """
+        Сколько секунд осталось до снятия ограничения частоты (0 — ограничения нет).
+        """
+        with self._lock:
+            return max(self._banned_until - time.time(), 0.0)
+
+    def _wait_for_ban(self):
+        remaining = self.ban_remaining()
+        while remaining > 0:
+            print(f"Превышен лимит запросов к API, ожидание {remaining:.0f} с...")
+            time.sleep(remaining)
+            remaining = self.ban_remaining()
+
+    def _pick(self, exclude=()):
+        self._wait_for_ban()
+        with self._lock:
+            candidates = [h for h in self.hosts if h not in exclude]
+            if not candidates:
+                return None
+            weights = [1 / max(self._score(h), 1e-6) for h in candidates]
+        return random.choices(candidates, weights=weights)[0]
+
+    def hedge_delay(self):
+        """
+        Через сколько секунд без ответа отправлять дубликат запроса.
+        """
+        with self._lock:
+            recent = sorted(self._recent)
+        if len(recent) < 20:
+            return self.initial_hedge_delay
+        index = min(len(recent) - 1, int(len(recent) * self.hedge_percentile / 100))
+        return max(recent[index], self.min_hedge_delay)
+
+    def _record(self, host, elapsed, status_code=None, retry_after=None):
+        with self._lock:
+            if status_code in RATE_LIMIT_STATUS_CODES:
+                # Лимит общий для всех хостов — останавливаем весь пул до истечения Retry-After
+                self._banned_until = max(self._banned_until, time.time() + (retry_after or 60))
+            elif status_code is not None and status_code not in RETRY_STATUS_CODES:
+                self._latencies[host].append(elapsed)
+                self._recent.append(elapsed)
+                self._errors[host] *= 0.9
+            else:
+                self._errors[host] += 1
+
+    def _request(self, host, path, params, symbol=None):
+        started = time.perf_counter()
+        try:
+            with span(f"GET {path}", cat="http", symbol=symbol, host=host):
+                response = self._sessions[host].get(host + path, params=params, timeout=self.timeout)
+        except requests.RequestException:
+            self._record(host, time.perf_counter() - started)
+            raise
+        retry_after = response.headers.get("Retry-After")
+        self._record(host, time.perf_counter() - started, response.status_code,
+                     float(retry_after) if retry_after and retry_after.isdigit() else None)
+        return response
+
+    def get(self, path, params=None):
+        """
+        Выполняет GET-запрос к одному из хостов.
+
+        :param path: Путь, например "/api/v3/klines"
+        :param params: Параметры запроса
+        :return: requests.Response первого успешного ответа, ответ 418/429
+                 или последний ответ с ошибкой
+        """
+        self._count("requests")
+        # Запросы выполняются в других потоках, поэтому символ для трассировки передаётся явно
+        symbol = current_symbol()
+        primary = self._pick()
+        futures = {self._executor.submit(self._request, primary, path, params, symbol): primary}
+        tried = {primary}
+        hedges = set()
+
+        done, _ = wait(futures, timeout=self.hedge_delay())
+        if not done and not self.ban_remaining():
+            secondary = self._pick(exclude=tried)
+            if secondary:
+                future = self._executor.submit(self._request, secondary, path, params, symbol)
+                futures[future] = secondary
+                hedges.add(future)
+                tried.add(secondary)
+                self._count("hedged")
+
+        pending = set(futures)
+        last_response = None
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.RequestException as e:
+                    last_error = e
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        if future in hedges:
+                            self._count("hedge_wins")
+                        return response
+                    last_response = response
+
+            if not pending:
+                # Все отправленные запросы неудачны (5xx или ошибка соединения) — пробуем ещё один хост
+                retry = self._pick(exclude=tried) if len(tried) < 2 else None
+                if retry:
+                    future = self._executor.submit(self._request, retry, path, params, symbol)
+                    futures[future] = retry
+                    tried.add(retry)
+                    pending = {future}
+                    self._count("retries")
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+    def health(self):
+        """
+        Текущее состояние хостов: {хост: {"score": ..., "errors": ..., "banned": ...}}.
+        Ограничение частоты действует на весь пул, поэтому "banned" у всех хостов одинаков.
+        """
+        banned = self.ban_remaining() > 0
+        with self._lock:
+            return {
+                host: {
+                    "score": self._score(host),
+                    "errors": round(self._errors[host], 3),
+                    "banned": banned,
+                }
+                for host in self.hosts
+            }
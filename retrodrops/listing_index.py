@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+import time
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS listings (
+    exchange TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    listing_ts INTEGER NOT NULL,
+    listing_price REAL,
+    source TEXT,
+    added_ts INTEGER,
+    PRIMARY KEY (exchange, symbol)
+)
+"""
+
+# Листинги из таблицы метрик прошлых запусков (metrics_store.py), если она есть в том же файле
+SEED_FROM_METRICS = """
+INSERT OR IGNORE INTO listings (exchange, symbol, listing_ts, listing_price, source, added_ts)
+SELECT exchange, symbol, listing_ts, listing_price, 'metrics', ?
+FROM metrics
+WHERE listing_ts IS NOT NULL AND listing_price IS NOT NULL
+"""
+
+
+class ListingIndex:
+    """
+    Постоянный индекс дат и цен листинга: {(биржа, символ): (listing_ts, listing_price)}.
+
+    Дата листинга не меняется, поэтому записи не устаревают: символ ищется на бирже
+    один раз, а повторные запуски берут его из индекса без запросов.
+    Индекс загружается в память целиком; доступ из нескольких потоков безопасен.
+    """
+
+    def __init__(self, path="metrics.db"):
+        """
+        :param path: Файл SQLite (по умолчанию общий с таблицей метрик)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(CREATE_TABLE)
+        self._conn.commit()
+        self._entries = {}
+        self.seed_from_metrics()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, exchange, symbol):
+        """
+        :return: Кортеж (listing_ts в мс, listing_price) или None, если символа нет в индексе
+        """
+        return self._entries.get((exchange, symbol))
+
+    def put(self, exchange, symbol, listing_ts, listing_price, source="klines"):
+        """
+        Добавляет найденный листинг. Существующая запись не перезаписывается.
+        """
+        self.seed(exchange, [(symbol, listing_ts, listing_price)], source)
+
+    def seed(self, exchange, entries, source="seed"):
+        """
+        Массово добавляет листинги (например, из метаданных инструментов биржи).
+
+        :param exchange: Название биржи ("binance", "bybit")
+        :param entries: Кортежи (symbol, listing_ts в мс, listing_price)
+        :param source: Источник данных для справки
+        :return: Число новых записей
+        """
+        added_ts = int(time.time() * 1000)
+        with self._lock:
+            new = [
+                (exchange, symbol, int(listing_ts), listing_price, source, added_ts)
+                for symbol, listing_ts, listing_price in entries
+                if (exchange, symbol) not in self._entries
+            ]
+            if not new:
+                return 0
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO listings (exchange, symbol, listing_ts, listing_price, source, added_ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    new,
+                )
+            for _, symbol, listing_ts, listing_price, _, _ in new:
+                self._entries[(exchange, symbol)] = (listing_ts, listing_price)
+        return len(new)
+
+    def seed_from_metrics(self):
+        """
+        Переносит листинги из таблицы metrics того же файла, если она есть.
+
+        :return: Число новых записей
+        """
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'metrics'").fetchone()
+            if not exists:
+                self._load()
+                return 0
+            with self._conn:
+                added = self._conn.execute(SEED_FROM_METRICS, (int(time.time() * 1000),)).rowcount
+            self._load()
+            return added
+
+    def _load(self):
+        self._entries = {
+            (exchange, symbol): (listing_ts, listing_price)
+            for exchange, symbol, listing_ts, listing_price in self._conn.execute(
+                "SELECT exchange, symbol, listing_ts, listing_price FROM listings")
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,294 @@
+import argparse
+import csv
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+# Сырые метрики, которые возвращают сборщики (fetch_ticker_metrics / fetch_symbol_metrics)
+METRIC_FIELDS = [
+    "symbol", "listing_ts", "listing_price",
+    "price_90d", "price_180d", "current_price",
+    "eth_listing_price", "eth_price_90d", "eth_price_180d", "eth_current_price",
+    "peak_price", "peak_ts", "lowest_price", "lowest_ts",
+    "eth_at_peak", "eth_at_lowest",
+]
+
+# Производные метрики, вычисляемые один раз при сохранении
+DERIVED_FIELDS = [
+    "change_90d", "change_180d", "change_current",
+    "eth_change_90d", "eth_change_180d", "eth_change_current",
+    "rel_90d", "rel_180d", "rel_current", "rel_peak", "rel_lowest",
+    "peak_change", "lowest_change",
+]
+
+COLUMNS = ["exchange"] + METRIC_FIELDS + DERIVED_FIELDS + ["updated_ts"]
+
+# Колонки, по которым чаще всего фильтруют и сортируют
+INDEXED_COLUMNS = [
+    "listing_ts", "change_90d", "change_180d", "change_current",
+    "rel_90d", "rel_180d", "rel_current", "lowest_change", "peak_change",
+]
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS metrics (
+    exchange TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    listing_ts INTEGER,
+    listing_price REAL,
+    price_90d REAL,
+    price_180d REAL,
+    current_price REAL,
+    eth_listing_price REAL,
+    eth_price_90d REAL,
+    eth_price_180d REAL,
+    eth_current_price REAL,
+    peak_price REAL,
+    peak_ts INTEGER,
+    lowest_price REAL,
+    lowest_ts INTEGER,
+    eth_at_peak REAL,
+    eth_at_lowest REAL,
+    change_90d REAL,
+    change_180d REAL,
+    change_current REAL,
+    eth_change_90d REAL,
+    eth_change_180d REAL,
+    eth_change_current REAL,
+    rel_90d REAL,
+    rel_180d REAL,
+    rel_current REAL,
+    rel_peak REAL,
+    rel_lowest REAL,
+    peak_change REAL,
+    lowest_change REAL,
+    updated_ts INTEGER,
+    PRIMARY KEY (exchange, symbol)
+)
+"""
+
+# Условие вида "change_90d > eth_change_90d" или "lowest_change < 0"
+CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|=|<|>)\s*(\S+)\s*$")
+
+
+def change_percent(current, base):
+    """
+    Вычисляет изменение в процентах относительно базовой цены.
+
+    :return: Процент изменения или None, если данных нет
+    """
+    if current is None or base is None or base == 0:
+        return None
+    return (current - base) / base * 100
+
+
+def relative_to_eth(coin_change, eth_change):
+    """
+    Отношение роста ETH к росту монеты: (1 + eth%) / (1 + coin%).
+    Значение меньше 1 означает, что монета обогнала ETH.
+    """
+    if coin_change is None or eth_change is None:
+        return None
+    coin_factor = 1 + coin_change / 100
+    if coin_factor == 0:
+        return None
+    return (1 + eth_change / 100) / coin_factor
+
+
+def derive_metrics(metrics):
+    """
+    Дополняет сырые метрики производными значениями (изменения и отношения к ETH).
+
+    :param metrics: Словарь сырых метрик
+    :return: Новый словарь с производными полями
+    """
+    m = {field: metrics.get(field) for field in METRIC_FIELDS}
+    m["change_90d"] = change_percent(m["price_90d"], m["listing_price"])
+    m["change_180d"] = change_percent(m["price_180d"], m["listing_price"])
+    m["change_current"] = change_percent(m["current_price"], m["listing_price"])
+    m["eth_change_90d"] = change_percent(m["eth_price_90d"], m["eth_listing_price"])
+    m["eth_change_180d"] = change_percent(m["eth_price_180d"], m["eth_listing_price"])
+    m["eth_change_current"] = change_percent(m["eth_current_price"], m["eth_listing_price"])
+    m["peak_change"] = change_percent(m["peak_price"], m["listing_price"])
+    m["lowest_change"] = change_percent(m["lowest_price"], m["listing_price"])
+    m["rel_90d"] = relative_to_eth(m["change_90d"], m["eth_change_90d"])
+    m["rel_180d"] = relative_to_eth(m["change_180d"], m["eth_change_180d"])
+    m["rel_current"] = relative_to_eth(m["change_current"], m["eth_change_current"])
+    m["rel_peak"] = relative_to_eth(m["peak_change"], change_percent(m["eth_at_peak"], m["eth_listing_price"]))
+    m["rel_lowest"] = relative_to_eth(m["lowest_change"], change_percent(m["eth_at_lowest"], m["eth_listing_price"]))
+    return m
+
+
+def open_metrics_db(path):
+    """
+    Открывает (и при необходимости создаёт) базу метрик.
+
+    :param path: Путь к файлу SQLite
+    :return: Соединение sqlite3
+    """
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute(CREATE_TABLE)
+    for column in INDEXED_COLUMNS:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_metrics_{column} ON metrics ({column})")
+    conn.commit()
+    return conn
+
+
+def save_metrics(path, exchange, metrics_list):
+    """
+    Сохраняет метрики в таблицу (существующие строки по тому же символу заменяются).
+
+    :param path: Путь к файлу SQLite
+    :param exchange: Название биржи ("binance", "bybit")
+    :param metrics_list: Список словарей сырых метрик
+    """
+    if not metrics_list:
+        return
+    updated_ts = int(time.time() * 1000)
+    rows = []
+    for metrics in metrics_list:
+        m = derive_metrics(metrics)
+        rows.append([exchange] + [m[c] for c in METRIC_FIELDS + DERIVED_FIELDS] + [updated_ts])
+
+    placeholders = ", ".join("?" for _ in COLUMNS)
+    conn = open_metrics_db(path)
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO metrics ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                rows,
+            )
+    finally:
+        conn.close()
+    print(f"Метрики ({len(rows)}) сохранены в {path}")
+
+
+def parse_condition(condition):
+    """
+    Разбирает условие фильтра вида "колонка оператор значение".
+    Значением может быть число или имя другой колонки.
+
+    :return: Кортеж (SQL-фрагмент, параметры)
+    """
+    match = CONDITION_PATTERN.match(condition)
+    if not match:
+        raise ValueError(f"Некорректное условие: {condition!r}")
+    column, operator, value = match.groups()
+    if column not in COLUMNS:
+        raise ValueError(f"Неизвестная колонка: {column}")
+    if value in COLUMNS:
+        return f"{column} {operator} {value}", []
+    try:
+        return f"{column} {operator} ?", [float(value)]
+    except ValueError:
+        return f"{column} {operator} ?", [value]
+
+
+def _date_to_ms(value):
+    if isinstance(value, datetime):
+        date_obj = value
+    else:
+        date_obj = datetime.strptime(value, "%Y-%m-%d")
+    if date_obj.tzinfo is None:
+        date_obj = date_obj.replace(tzinfo=timezone.utc)
+    return int(date_obj.timestamp() * 1000)
+
+
+def screen_metrics(conn, exchange=None, listed_from=None, listed_to=None,
+                   conditions=(), order_by=None, descending=False, limit=None):
+    """
+    Выборка монет по условиям.
+
+    Пример: монеты, листинговавшиеся в 2024 году, обогнавшие ETH за 90 дней,
+    но опускавшиеся ниже цены листинга в течение 180 дней:
+
+        screen_metrics(conn, listed_from="2024-01-01", listed_to="2025-01-01",
+                       conditions=["rel_90d < 1", "lowest_change < 0"])
+
+    :param conn: Соединение, полученное из open_metrics_db
+    :param exchange: Ограничить одной биржей
+    :param listed_from: Дата листинга не раньше (ГГГГ-ММ-ДД или datetime)
+    :param listed_to: Дата листинга раньше (ГГГГ-ММ-ДД или datetime)
+    :param conditions: Список условий для parse_condition
+    :param order_by: Колонка для сортировки
+    :param descending: Сортировать по убыванию
+    :param limit: Максимальное число строк
+    :return: Список словарей
+    """
+    clauses = []
+    params = []
+    if exchange:
+        clauses.append("exchange = ?")
+        params.append(exchange)
+    if listed_from:
+        clauses.append("listing_ts >= ?")
+        params.append(_date_to_ms(listed_from))
+    if listed_to:
+        clauses.append("listing_ts < ?")
+        params.append(_date_to_ms(listed_to))
+    for condition in conditions:
+        clause, clause_params = parse_condition(condition)
+        clauses.append(clause)
+        params.extend(clause_params)
+
+    query = "SELECT * FROM metrics"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    if order_by:
+        if order_by not in COLUMNS:
+            raise ValueError(f"Неизвестная колонка: {order_by}")
+        # NULL всегда в конце, независимо от направления сортировки
+        query += f" ORDER BY {order_by} IS NULL, {order_by} {'DESC' if descending else 'ASC'}"
+    if limit:
+        query += " LIMIT ?"
+        params.append(int(limit))
+
+    return [dict(row) for row in conn.execute(query, params)]
+
+
+def main(argv=None, prog=None):
+    """
+    :param argv: Параметры командной строки (по умолчанию sys.argv[1:])
+    :param prog: Имя программы в справке (например, "retrodrops serve")
+    """
+    parser = argparse.ArgumentParser(prog=prog, description="Выборка монет из таблицы метрик.")
+    parser.add_argument("--db", default="metrics.db", help="Путь к базе метрик")
+    parser.add_argument("--exchange", help="binance или bybit")
+    parser.add_argument("--listed-from", help="Дата листинга не раньше (ГГГГ-ММ-ДД)")
+    parser.add_argument("--listed-to", help="Дата листинга раньше (ГГГГ-ММ-ДД)")
+    parser.add_argument("--where", action="append", default=[],
+                        help='Условие, например "rel_90d < 1" или "change_90d > eth_change_90d"')
+    parser.add_argument("--sort", help="Колонка сортировки")
+    parser.add_argument("--desc", action="store_true", help="Сортировать по убыванию")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--columns", default="exchange,symbol,listing_ts,listing_price,change_90d,change_180d,rel_90d,rel_180d,lowest_change",
+                        help="Выводимые колонки через запятую")
+    args = parser.parse_args(argv)
+
+    columns = [c.strip() for c in args.columns.split(",") if c.strip()]
+
+    conn = open_metrics_db(args.db)
+    try:
+        started = time.perf_counter()
+        rows = screen_metrics(conn, exchange=args.exchange, listed_from=args.listed_from,
+                              listed_to=args.listed_to, conditions=args.where,
+                              order_by=args.sort, descending=args.desc, limit=args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+    except ValueError as e:
+        print(f"Ошибка: {e}")
+        return 1
+    finally:
+        conn.close()
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([row.get(c) for c in columns])
+    print(f"Найдено {len(rows)} строк за {elapsed:.1f} мс", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
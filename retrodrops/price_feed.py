@@ -0,0 +1,210 @@
+import json
+import socket
+import threading
+import time
+
+import websocket  # пакет websocket-client
+
+# Публичные WebSocket-эндпоинты тикеров
+BINANCE_WS_URL = "wss://stream.binance.com:9443/ws"
+BYBIT_WS_URL = "wss://stream.bybit.com/v5/public/spot"
+
+# Ограничения бирж: Binance — до 1024 потоков на соединение,
+# Bybit — до 10 топиков в одном сообщении подписки
+STREAMS_PER_CONNECTION = {"binance": 200, "bybit": 200}
+TOPICS_PER_MESSAGE = {"binance": 100, "bybit": 10}
+
+
+class PriceFeed:
+    """
+    Таблица последних цен, поддерживаемая подпиской на тикеры Binance или Bybit.
+
+    Соединения переподключаются автоматически и повторно подписываются на все символы.
+    Для проверки без биржи можно передать url локального WebSocket-сервера.
+    """
+
+    def __init__(self, exchange, symbols, url=None, reconnect_delay=1.0, max_reconnect_delay=30.0):
+        """
+        :param exchange: "binance" или "bybit"
+        :param symbols: Список торговых пар (например, ["BTCUSDT", "ETHUSDT"])
+        :param url: Адрес WebSocket (по умолчанию — публичный эндпоинт биржи)
+        :param reconnect_delay: Начальная пауза перед переподключением, сек
+        :param max_reconnect_delay: Максимальная пауза перед переподключением, сек
+        """
+        if exchange not in STREAMS_PER_CONNECTION:
+            raise ValueError(f"Неизвестная биржа: {exchange}")
+        self.exchange = exchange
+        self.symbols = sorted({s.strip().upper() for s in symbols if s.strip()})
+        self.url = url or (BINANCE_WS_URL if exchange == "binance" else BYBIT_WS_URL)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._prices = {}
+        self._updated = {}
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._sockets = []
+        self._threads = []
+
+    def start(self):
+        """
+        Открывает соединения (по одному на группу символов) в фоновых потоках.
+        """
+        self._stopped.clear()
+        size = STREAMS_PER_CONNECTION[self.exchange]
+        for offset in range(0, len(self.symbols), size):
+            chunk = self.symbols[offset:offset + size]
+            thread = threading.Thread(target=self._run, args=(chunk,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """
+        Закрывает все соединения и останавливает переподключение.
+        """
+        self._stopped.set()
+        for ws in list(self._sockets):
+            ws.keep_running = False
+            try:
+                # shutdown() будит поток run_forever, ожидающий в select(), и он сам закрывает соединение;
+                # после close() закрытый сокет выпадает из select() и поток ждёт до таймаута пинга
+                ws.sock.sock.shutdown(socket.SHUT_RDWR)
+            except (AttributeError, OSError):
+                try:
+                    ws.close()
+                except Exception:
+                    pass
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def get(self, symbol, timeout=0):
+        """
+        Возвращает последнюю цену символа.
+
+        :param symbol: Торговая пара
+        :param timeout: Сколько секунд ждать первой цены, если её ещё нет
+        :return: Цена или None
+        """
+        symbol = symbol.upper()
+        with self._condition:
+            self._condition.wait_for(lambda: symbol in self._prices or self._stopped.is_set(), timeout=timeout)
+            return self._prices.get(symbol)
+
+    def wait(self, timeout=10):
+        """
+        Ждёт, пока по всем символам придёт хотя бы одна цена.
+
+        :return: True, если цены получены по всем символам
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._prices) >= len(self.symbols), timeout=timeout)
+
+    def snapshot(self):
+        """
+        Копия таблицы последних цен: {символ: (цена, время обновления в мс)}.
+        """
+        with self._condition:
+            return {s: (p, self._updated[s]) for s, p in self._prices.items()}
+
+    def _set_price(self, symbol, price):
+        with self._condition:
+            self._prices[symbol] = price
+            self._updated[symbol] = int(time.time() * 1000)
+            self._condition.notify_all()
+
+    def _subscribe_messages(self, symbols):
+        step = TOPICS_PER_MESSAGE[self.exchange]
+        messages = []
+        for offset in range(0, len(symbols), step):
+            chunk = symbols[offset:offset + step]
+            if self.exchange == "binance":
+                messages.append({
+                    "method": "SUBSCRIBE",
+                    "params": [f"{s.lower()}@miniTicker" for s in chunk],
+                    "id": offset + 1,
+                })
+            else:
+                messages.append({"op": "subscribe", "args": [f"tickers.{s}" for s in chunk]})
+        return messages
+
+    def _handle_message(self, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+
+        if self.exchange == "binance":
+            # Ответы на подписку ({"result": null, "id": 1}) пропускаем
+            event = data.get("data", data)
+            symbol, price = event.get("s"), event.get("c")
+        else:
+            if not str(data.get("topic", "")).startswith("tickers."):
+                return
+            event = data.get("data") or {}
+            symbol, price = event.get("symbol"), event.get("lastPrice")
+
+        if symbol and price is not None:
+            try:
+                self._set_price(symbol, float(price))
+            except ValueError:
+                pass
+
+    def _heartbeat(self, ws):
+        # Bybit закрывает соединение без {"op": "ping"} примерно раз в 20 секунд
+        while not self._stopped.wait(20):
+            if ws not in self._sockets:
+                return
+            try:
+                ws.send(json.dumps({"op": "ping"}))
+            except Exception:
+                return
+
+    def _run(self, symbols):
+        delay = self.reconnect_delay
+
+        def on_open(ws):
+            nonlocal delay
+            delay = self.reconnect_delay
+            for message in self._subscribe_messages(symbols):
+                ws.send(json.dumps(message))
+                if self.exchange == "binance":
+                    # Binance принимает не более 5 сообщений в секунду на соединение
+                    time.sleep(0.25)
+            if self.exchange == "bybit":
+                threading.Thread(target=self._heartbeat, args=(ws,), daemon=True).start()
+
+        def on_message(ws, message):
+            self._handle_message(message)
+
+        def on_error(ws, error):
+            if not self._stopped.is_set():
+                print(f"Ошибка WebSocket ({self.exchange}): {error}")
+
+        while not self._stopped.is_set():
+            ws = websocket.WebSocketApp(self.url, on_open=on_open, on_message=on_message, on_error=on_error)
+            self._sockets.append(ws)
+            try:
+                ws.run_forever(ping_interval=30, ping_timeout=10)
+            finally:
+                self._sockets.remove(ws)
+            if self._stopped.wait(delay):
+                break
+            print(f"Переподключение к {self.url}...")
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Пример: python -m retrodrops.price_feed binance BTCUSDT ETHUSDT
+    feed = PriceFeed(sys.argv[1], sys.argv[2:]).start()
+    try:
+        while True:
+            time.sleep(1)
+            print(", ".join(f"{s}: {p}" for s, (p, _) in sorted(feed.snapshot().items())))
+    except KeyboardInterrupt:
+        feed.stop()
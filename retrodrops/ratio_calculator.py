@@ -0,0 +1,286 @@
+import csv
+import io
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+def calculate_ratio_row(base_number, target_numbers):
+    """
+    Вычисляет процентное отличие и значение изменения для каждого числа строки.
+
+    :param base_number: Опорное значение (не 0)
+    :param target_numbers: Список чисел для сравнения с опорным
+    :return: Список кортежей (число, процентное отличие, значение изменения)
+    """
+    results = []
+    for target_number in target_numbers:
+        percentage_difference = ((target_number - base_number) / base_number) * 100
+
+        # Вычисляем значение изменения для файла изменений
+        if percentage_difference < 100:
+            ratio_value = 1 - abs(percentage_difference) / 100
+        else:
+            ratio_value = 1 + abs(percentage_difference) / 100
+
+        results.append((target_number, percentage_difference, round(ratio_value, 2)))
+    return results
+
+def calculate_percentage_difference_from_csv(file_path="input.csv", output_file="output.xls", ratio_output_file="ratio.xls"):
+    """
+    :param file_path: Входной CSV (разделитель ";", десятичная запятая)
+    :param output_file: Excel-файл с числами и процентами
+    :param ratio_output_file: Excel-файл только с изменениями
+    """
+    try:
+        import xlwt
+
+        # Создаем Excel-файл для основных результатов
+        workbook = xlwt.Workbook()
+        sheet = workbook.add_sheet("Результаты")
+
+        # Создаем Excel-файл для данных только об изменениях
+        ratio_workbook = xlwt.Workbook()
+        ratio_sheet = ratio_workbook.add_sheet("Изменения")
+
+        # Записываем заголовки для основного файла
+        sheet.write(0, 0, "Опорное значение")
+
+        with open(file_path, newline='', encoding='utf-8') as csvfile:
+            reader = csv.reader(csvfile, delimiter=';')
+            row_index = 1
+            ratio_row_index = 0
+
+            for row in reader:
+                if len(row) < 2:
+                    print("Ошибка: строка должна содержать хотя бы два числа.")
+                    continue
+
+                try:
+                    # Преобразуем первую ячейку в число (опорное значение)
+                    base_number = float(row[0].replace(',', '.'))
+                    if base_number == 0:
+                        print("Ошибка: первое число в строке равно 0, вычисление невозможно.")
+                        continue
+
+                    # Обрабатываем остальные числа в строке
+                    target_numbers = [float(value.replace(',', '.')) for value in row[1:]]
+                    ratio_results = calculate_ratio_row(base_number, target_numbers)
+
+                    # Записываем опорное значение в основной Excel
+                    sheet.write(row_index, 0, str(base_number).replace('.', ','))
+
+                    ratio_row = []
+                    for col, (target_number, percentage_difference, ratio_value) in enumerate(ratio_results, start=1):
+                        # Форматируем вывод для основного Excel
+                        sign = "+" if percentage_difference > 0 else ""
+                        result = f"{str(target_number).replace('.', ',')} ({sign}{round(percentage_difference)}%)"
+                        sheet.write(row_index, col, result)
+
+                        ratio_row.append(ratio_value)
+
+                    # Записываем строку изменений в ratio.xls
+                    for ratio_col, ratio_value in enumerate(ratio_row):
+                        ratio_sheet.write(ratio_row_index, ratio_col, ratio_value)
+
+                    row_index += 1
+                    ratio_row_index += 1
+                except ValueError:
+                    print("Ошибка: строка содержит некорректные данные.")
+
+        # Сохраняем Excel-файлы
+        workbook.save(output_file)
+        ratio_workbook.save(ratio_output_file)
+
+        print(f"Результаты сохранены в файлы: {output_file} и {ratio_output_file}")
+    except FileNotFoundError:
+        print(f"Ошибка: файл {file_path} не найден.")
+    except Exception as e:
+        print(f"Произошла ошибка: {e}")
+
+def _parse_chunk(block, width):
+    """
+    Разбирает блок строк входного CSV в таблицу pyarrow из width колонок float.
+    Строки с другим числом ячеек или некорректными числами пропускаются.
+
+    :return: Кортеж (таблица, число пропущенных строк)
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    names = [f"c{i}" for i in range(width)]
+    skipped = []
+
+    def skip_row(row):
+        skipped.append(row.number)
+        return "skip"
+
+    try:
+        table = pa_csv.read_csv(
+            io.BytesIO(block),
+            read_options=pa_csv.ReadOptions(column_names=names, use_threads=False),
+            parse_options=pa_csv.ParseOptions(delimiter=';', invalid_row_handler=skip_row),
+            convert_options=pa_csv.ConvertOptions(
+                decimal_point=',', column_types={name: pa.float64() for name in names}),
+        )
+        return table, len(skipped)
+    except pa.ArrowInvalid:
+        # В блоке есть нечисловые ячейки — разбираем построчно, как в обычном режиме
+        columns = [[] for _ in names]
+        bad_rows = 0
+        for row in csv.reader(io.StringIO(block.decode('utf-8')), delimiter=';'):
+            if len(row) != width:
+                bad_rows += 1
+                continue
+            try:
+                numbers = [float(value.replace(',', '.')) if value else None for value in row]
+            except ValueError:
+                bad_rows += 1
+                continue
+            for column, number in zip(columns, numbers):
+                column.append(number)
+        table = pa.Table.from_arrays([pa.array(c, type=pa.float64()) for c in columns], names=names)
+        return table, bad_rows
+
+
+def _compute_chunk(block, width):
+    """
+    Векторно вычисляет процентные отличия и значения изменения для блока строк.
+
+    :return: Кортеж (таблица результатов, таблица изменений, число пропущенных строк)
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    table, skipped = _parse_chunk(block, width)
+    # Как и в обычном режиме, пропускаются строки с пустыми ячейками и с нулевым опорным значением
+    valid = pc.not_equal(table.column(0), 0.0)
+    for column in table.columns:
+        valid = pc.and_(valid, pc.is_valid(column))
+    valid = pc.fill_null(valid, False)
+    skipped += len(table) - (pc.sum(valid).as_py() or 0)
+    table = table.filter(valid)
+    base = table.column(0)
+
+    result_columns = {"base": base}
+    ratio_columns = {}
+    for i in range(1, width):
+        target = table.column(i)
+        percentage_difference = pc.multiply(pc.divide(pc.subtract(target, base), base), 100.0)
+        change = pc.divide(pc.abs(percentage_difference), 100.0)
+        ratio_value = pc.if_else(pc.less(percentage_difference, 100.0),
+                                 pc.subtract(1.0, change), pc.add(1.0, change))
+        result_columns[f"value_{i}"] = target
+        result_columns[f"change_{i}"] = percentage_difference
+        ratio_columns[f"ratio_{i}"] = pc.round(ratio_value, 2)
+
+    return pa.table(result_columns), pa.table(ratio_columns), skipped
+
+
+def _result_schemas(width):
+    """
+    Схемы выходных таблиц потокового режима для строк из width чисел.
+
+    :return: Кортеж (схема результатов, схема изменений)
+    """
+    import pyarrow as pa
+
+    result_fields = [("base", pa.float64())]
+    ratio_fields = []
+    for i in range(1, width):
+        result_fields += [(f"value_{i}", pa.float64()), (f"change_{i}", pa.float64())]
+        ratio_fields.append((f"ratio_{i}", pa.float64()))
+    return pa.schema(result_fields), pa.schema(ratio_fields)
+
+
+def _read_chunks(file_path, chunk_rows):
+    with open(file_path, 'rb') as file:
+        while True:
+            lines = list(itertools.islice(file, chunk_rows))
+            if not lines:
+                return
+            yield b"".join(lines)
+
+
+def _open_writer(path, schema):
+    if path.lower().endswith(".csv"):
+        import pyarrow.csv as pa_csv
+
+        return pa_csv.CSVWriter(path, schema, write_options=pa_csv.WriteOptions(delimiter=';'))
+    import pyarrow.parquet as pq
+
+    return pq.ParquetWriter(path, schema)
+
+
+def calculate_ratio_stream(file_path="input.csv", output_file="output.parquet", ratio_output_file="ratio.parquet",
+                           chunk_rows=100000, workers=1):
+    """
+    Потоковый режим для больших входных файлов: строки обрабатываются блоками по chunk_rows,
+    вычисления векторные (pyarrow), результаты дописываются в файлы после каждого блока,
+    поэтому расход памяти не зависит от размера входа.
+
+    Результаты числовые: Parquet или CSV (по расширению файла) с колонками
+    base, value_N, change_N (процентное отличие) и ratio_N. Все строки должны содержать
+    столько же чисел, сколько первая; остальные пропускаются.
+
+    :param file_path: Входной CSV (разделитель ";", десятичная запятая)
+    :param output_file: Файл с числами и процентными отличиями
+    :param ratio_output_file: Файл только с изменениями
+    :param chunk_rows: Число строк в блоке
+    :param workers: Число процессов (1 — в текущем процессе)
+    """
+    if chunk_rows < 1 or workers < 1:
+        print("Ошибка: размер блока и число процессов должны быть не меньше 1.")
+        return
+    for path in (output_file, ratio_output_file):
+        if not path.lower().endswith((".parquet", ".csv")):
+            print(f"Ошибка: потоковый режим записывает только .parquet или .csv, получено {path}")
+            return
+
+    try:
+        with open(file_path, newline='', encoding='utf-8') as csvfile:
+            first_row = next((row for row in csv.reader(csvfile, delimiter=';') if row), None)
+    except FileNotFoundError:
+        print(f"Ошибка: файл {file_path} не найден.")
+        return
+    if first_row is None or len(first_row) < 2:
+        print("Ошибка: строка должна содержать хотя бы два числа.")
+        return
+    width = len(first_row)
+
+    # Файлы открываются сразу: даже без подходящих строк на выходе будут файлы с заголовками
+    result_schema, ratio_schema = _result_schemas(width)
+    writer = _open_writer(output_file, result_schema)
+    ratio_writer = _open_writer(ratio_output_file, ratio_schema)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    rows = skipped = 0
+
+    def write(result):
+        nonlocal rows, skipped
+        result_table, ratio_table, chunk_skipped = result
+        writer.write_table(result_table)
+        ratio_writer.write_table(ratio_table)
+        rows += len(result_table)
+        skipped += chunk_skipped
+
+    try:
+        if executor is None:
+            for block in _read_chunks(file_path, chunk_rows):
+                write(_compute_chunk(block, width))
+        else:
+            # Не больше двух блоков на процесс в обработке, чтобы память оставалась постоянной
+            pending = deque()
+            for block in _read_chunks(file_path, chunk_rows):
+                pending.append(executor.submit(_compute_chunk, block, width))
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        writer.close()
+        ratio_writer.close()
+
+    if skipped:
+        print(f"Пропущено строк с некорректными данными: {skipped}")
+    print(f"Обработано строк: {rows}. Результаты сохранены в файлы: {output_file} и {ratio_output_file}")
@@ -0,0 +1,165 @@
+import csv
+import os
+
+from .metrics_store import DERIVED_FIELDS, METRIC_FIELDS, derive_metrics
+
+# Типы колонок результата: "string", "timestamp" (мс, UTC) или "float"
+COLUMN_TYPES = {"exchange": "string", "symbol": "string", "listing_ts": "timestamp",
+                "peak_ts": "timestamp", "lowest_ts": "timestamp"}
+RESULT_COLUMNS = ["exchange"] + METRIC_FIELDS + DERIVED_FIELDS
+
+
+def column_type(name):
+    return COLUMN_TYPES.get(name, "float")
+
+
+class ResultTable:
+    """
+    Результат сборщика в колоночном виде: числа — float, даты — метки времени,
+    отсутствующие значения — None (null).
+
+    Вместе с числовыми колонками хранит отформатированные строки таблицы (headers, rows),
+    которые используются только при выводе в XLS/CSV.
+    """
+
+    def __init__(self, columns, headers=None, rows=None, types=None):
+        """
+        :param columns: Словарь {колонка: список значений}
+        :param headers: Заголовки отформатированной таблицы
+        :param rows: Отформатированные строки (список списков)
+        :param types: Типы колонок, не описанных в COLUMN_TYPES: {колонка: "string" | "timestamp" | "float"}
+        """
+        self.columns = columns
+        self.headers = headers or []
+        self.rows = rows or []
+        self.types = types or {}
+
+    @classmethod
+    def from_metrics(cls, exchange, metrics_list, headers=None, rows=None, symbols=None):
+        """
+        Строит таблицу из сырых метрик сборщика.
+
+        :param symbols: Символы в порядке metrics_list. Если указаны, для None в списке
+                        (символ не обработан) создаётся строка с символом и пустыми значениями,
+                        как и в отформатированной таблице; иначе такие элементы пропускаются.
+        """
+        columns = {name: [] for name in RESULT_COLUMNS}
+        for index, metrics in enumerate(metrics_list):
+            if metrics is None:
+                if symbols is None:
+                    continue
+                metrics = {"symbol": symbols[index]}
+            m = derive_metrics(metrics)
+            m["exchange"] = exchange
+            for name in RESULT_COLUMNS:
+                value = m[name]
+                if value is not None and column_type(name) == "float":
+                    value = float(value)
+                columns[name].append(value)
+        return cls(columns, headers, rows)
+
+    def __len__(self):
+        return len(self.columns["symbol"])
+
+    def to_arrow(self):
+        """
+        Преобразует таблицу в pyarrow.Table с явной схемой.
+        """
+        import pyarrow as pa
+
+        arrow_types = {
+            "string": pa.string(),
+            "timestamp": pa.timestamp("ms", tz="UTC"),
+            "float": pa.float64(),
+        }
+        schema = pa.schema([(name, arrow_types[self.types.get(name) or column_type(name)]) for name in self.columns])
+        arrays = [pa.array(self.columns[name], type=schema.field(name).type) for name in self.columns]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(table, path):
+    import pyarrow.parquet as pq
+
+    pq.write_table(table.to_arrow(), path)
+
+
+def write_arrow(table, path):
+    import pyarrow.feather as feather
+
+    # Feather v2 — файл Arrow IPC, читается без разбора и может отображаться в память
+    feather.write_feather(table.to_arrow(), path, compression="uncompressed")
+
+
+def render_csv(table, path):
+    with open(path, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(table.headers)
+        writer.writerows(table.rows)
+
+
+def render_xls(table, path):
+    import xlwt
+
+    wb = xlwt.Workbook()
+    sheet = wb.add_sheet("Data")
+    for col_num, header in enumerate(table.headers):
+        sheet.write(0, col_num, header)
+    for row_num, row in enumerate(table.rows, start=1):
+        for col_num, value in enumerate(row):
+            sheet.write(row_num, col_num, value)
+    wb.save(path)
+
+
+# Форматы вывода: {формат: (расширение файла, функция записи)}
+WRITERS = {
+    "parquet": (".parquet", write_parquet),
+    "arrow": (".arrow", write_arrow),
+    "csv": (".csv", render_csv),
+    "xls": (".xls", render_xls),
+}
+
+DEFAULT_FORMAT = "parquet"
+
+
+def register_writer(fmt, extension, writer):
+    """
+    Регистрирует дополнительный формат вывода.
+
+    :param fmt: Название формата
+    :param extension: Расширение файла (с точкой)
+    :param writer: Функция writer(table, path)
+    """
+    WRITERS[fmt] = (extension, writer)
+
+
+def output_path(base_name, fmt=DEFAULT_FORMAT):
+    """
+    Имя выходного файла для формата, например ("ticker_data", "parquet") -> "ticker_data.parquet".
+    """
+    return base_name + WRITERS[fmt][0]
+
+
+def write_result(table, path, fmt=None):
+    """
+    Записывает результат в файл. Если формат не указан, он определяется по расширению.
+    """
+    if fmt is None:
+        extension = os.path.splitext(path)[1].lower()
+        fmt = next((name for name, (ext, _) in WRITERS.items() if ext == extension), DEFAULT_FORMAT)
+    if fmt not in WRITERS:
+        raise ValueError(f"Неизвестный формат вывода: {fmt}")
+    WRITERS[fmt][1](table, path)
+    print(f"Данные успешно сохранены в {path}")
+
+
+def read_result(path):
+    """
+    Читает сохранённый результат (Parquet или Arrow) как pyarrow.Table.
+    """
+    if path.lower().endswith(WRITERS["arrow"][0]):
+        import pyarrow.feather as feather
+
+        return feather.read_table(path, memory_map=True)
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path)
@@ -0,0 +1,163 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Активный трассировщик; None — трассировка выключена и span() ничего не делает
+_tracer = None
+_local = threading.local()
+_NULL_SPAN = nullcontext()
+
+# cProfile (Python 3.12+) допускает один активный профилировщик на процесс
+_profiler_lock = threading.Lock()
+
+
+class Tracer:
+    """
+    Собирает интервалы (span) этапов обработки и HTTP-запросов в формате
+    Chrome trace-event и, по желанию, профиль cProfile для каждого этапа.
+
+    Если этапы выполняются в нескольких потоках одновременно (collect-all), профилируется
+    только один этап за раз; остальные записываются в трассировку без профиля.
+    """
+
+    def __init__(self, profile_dir=None):
+        """
+        :param profile_dir: Каталог для файлов <этап>.prof; None — без профилирования
+        """
+        self.profile_dir = profile_dir
+        self.events = []
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def span(self, name, cat, symbol, args):
+        symbol = symbol or current_symbol()
+        profile = None
+        if (self.profile_dir and cat == "stage" and not getattr(_local, "profiling", False)
+                and _profiler_lock.acquire(blocking=False)):
+            # Вложенные этапы попадают в профиль внешнего этапа
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+            except ValueError:
+                # Профилировщик уже запущен вне трассировки
+                profile = None
+                _profiler_lock.release()
+            else:
+                _local.profiling = True
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            if profile is not None:
+                profile.disable()
+                _local.profiling = False
+                _profiler_lock.release()
+            if symbol:
+                args = dict(args, symbol=symbol)
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (started - self._origin) * 1e6,
+                "dur": (finished - started) * 1e6,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self.events.append(event)
+                if profile is not None:
+                    self._profiles.setdefault(name, []).append(profile)
+
+    def summary(self):
+        """
+        Суммарное время по этапам, сек: {(категория, имя): время}.
+        """
+        totals = {}
+        with self._lock:
+            for event in self.events:
+                if event["cat"] in ("stage", "http"):
+                    key = (event["cat"], event["name"])
+                    totals[key] = totals.get(key, 0) + event["dur"] / 1e6
+        return totals
+
+    def export(self, path):
+        """
+        Сохраняет трассировку в JSON (открывается в chrome://tracing или Perfetto)
+        и профили этапов в profile_dir.
+        """
+        with self._lock:
+            events = list(self.events)
+            profiles = {name: list(items) for name, items in self._profiles.items()}
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        print(f"Трассировка сохранена в {path}")
+
+        if self.profile_dir and profiles:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            for name, items in profiles.items():
+                stats = pstats.Stats(items[0])
+                for profile in items[1:]:
+                    stats.add(profile)
+                stats.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+            print(f"Профили этапов сохранены в {self.profile_dir}")
+
+        for (cat, name), seconds in sorted(self.summary().items(), key=lambda item: -item[1]):
+            print(f"  {cat:5} {name:30} {seconds:8.2f} с")
+
+
+def enable(profile_dir=None):
+    """
+    Включает трассировку для всего процесса.
+    """
+    global _tracer
+    _tracer = Tracer(profile_dir)
+    return _tracer
+
+
+def disable():
+    global _tracer
+    _tracer = None
+
+
+def get_tracer():
+    return _tracer
+
+
+def current_symbol():
+    return getattr(_local, "symbol", None)
+
+
+@contextmanager
+def symbol_scope(symbol):
+    """
+    Помечает все интервалы внутри блока символом и записывает общий интервал символа.
+    """
+    previous = current_symbol()
+    _local.symbol = symbol
+    try:
+        with span(symbol, cat="symbol"):
+            yield
+    finally:
+        _local.symbol = previous
+
+
+def span(name, cat="stage", symbol=None, **args):
+    """
+    Интервал этапа (cat="stage") или HTTP-запроса (cat="http").
+
+    :param name: Название этапа
+    :param cat: Категория
+    :param symbol: Символ; по умолчанию — из symbol_scope текущего потока
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, cat, symbol, args)
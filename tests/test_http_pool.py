@@ -0,0 +1,115 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from retrodrops import http_pool
+from retrodrops.http_pool import HostPool
+
+
+class FakeHost:
+    """
+    Локальный HTTP-сервер, отвечающий заданными кодами с задержкой.
+    """
+
+    def __init__(self, statuses=(200,), delay=0.0, retry_after=None):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.retry_after = retry_after
+        self.hits = 0
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                host.hits += 1
+                # Последний код в списке повторяется для всех следующих запросов
+                status = host.statuses.pop(0) if len(host.statuses) > 1 else host.statuses[0]
+                time.sleep(host.delay)
+                body = b"{}"
+                self.send_response(status)
+                if host.retry_after is not None and status in (418, 429):
+                    self.send_header("Retry-After", str(host.retry_after))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def hosts():
+    created = []
+
+    def make(*args, **kwargs):
+        host = FakeHost(*args, **kwargs)
+        created.append(host)
+        return host
+
+    yield make
+    for host in created:
+        host.close()
+
+
+@pytest.fixture(autouse=True)
+def first_host_first(monkeypatch):
+    # Детерминированный выбор: первичным всегда становится первый доступный хост
+    monkeypatch.setattr(http_pool.random, "choices", lambda candidates, weights: [candidates[0]])
+
+
+def test_retries_5xx_on_another_host(hosts):
+    failing, healthy = hosts([503]), hosts([200])
+    pool = HostPool([failing.url, healthy.url], initial_hedge_delay=5)
+
+    for _ in range(3):
+        assert pool.get("/api/v3/klines").status_code == 200
+
+    assert failing.hits == 3
+    assert healthy.hits == 3
+    assert pool.stats["retries"] == 3
+    assert pool.stats["hedged"] == 0
+    assert pool.stats["hedge_wins"] == 0
+
+
+def test_hedges_slow_host(hosts):
+    slow, fast = hosts([200], delay=0.5), hosts([200])
+    pool = HostPool([slow.url, fast.url], initial_hedge_delay=0.05)
+
+    started = time.perf_counter()
+    for _ in range(3):
+        assert pool.get("/api/v3/klines").status_code == 200
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert pool.stats["hedged"] == 3
+    assert pool.stats["hedge_wins"] == 3
+    assert pool.stats["retries"] == 0
+
+
+@pytest.mark.parametrize("status", [418, 429])
+def test_rate_limit_bans_whole_pool(hosts, status):
+    limited, other = hosts([status, 200], retry_after=1), hosts([200])
+    pool = HostPool([limited.url, other.url], initial_hedge_delay=5)
+
+    response = pool.get("/api/v3/klines")
+    assert response.status_code == status
+    # Запрос не повторяется на другом хосте: лимит общий для всех хостов
+    assert other.hits == 0
+    assert pool.stats["retries"] == 0
+    assert pool.ban_remaining() > 0
+    assert all(h["banned"] for h in pool.health().values())
+
+    started = time.perf_counter()
+    assert pool.get("/api/v3/klines").status_code == 200
+    assert time.perf_counter() - started >= 0.9
+    assert other.hits == 0
+    assert pool.ban_remaining() == 0
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("websocket")
+websockets_server = pytest.importorskip("websockets.asyncio.server")
+
+from retrodrops.price_feed import PriceFeed
+
+
+class FakeTickerServer:
+    """
+    Локальный WebSocket-сервер тикеров. Первое соединение закрывается сразу после
+    ответа на подписку, чтобы проверить переподключение и повторную подписку.
+    """
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.connections = 0
+        self.subscriptions = []
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait(5)
+
+    def _ticker(self, topic, price):
+        if self.exchange == "binance":
+            return {"e": "24hrMiniTicker", "s": topic.split("@")[0].upper(), "c": str(price)}
+        symbol = topic.split(".", 1)[1]
+        return {"topic": topic, "data": {"symbol": symbol, "lastPrice": str(price)}}
+
+    async def _handler(self, ws):
+        self.connections += 1
+        connection = self.connections
+        async for message in ws:
+            data = json.loads(message)
+            if data.get("op") == "ping":
+                continue
+            topics = data["params"] if self.exchange == "binance" else data["args"]
+            self.subscriptions.append((connection, topics))
+            for topic in topics:
+                await ws.send(json.dumps(self._ticker(topic, 100 + connection)))
+            if connection == 1:
+                await ws.close()
+                return
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+
+        async def main():
+            async with websockets_server.serve(self._handler, "127.0.0.1", 0) as server:
+                self.url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+                self._stop = asyncio.Event()
+                self._ready.set()
+                await self._stop.wait()
+
+        self._loop.run_until_complete(main())
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._stop.set)
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.parametrize("exchange", ["binance", "bybit"])
+def test_reconnects_and_resubscribes(exchange):
+    server = FakeTickerServer(exchange)
+    feed = PriceFeed(exchange, ["AAAUSDT", "ETHUSDT"], url=server.url, reconnect_delay=0.1).start()
+    try:
+        assert feed.wait(timeout=5)
+        # После разрыва соединения цены приходят уже со второго соединения
+        assert wait_until(lambda: feed.get("ETHUSDT") == 102.0)
+        assert wait_until(lambda: feed.get("AAAUSDT") == 102.0)
+        assert server.connections >= 2
+        subscribed = {connection: set() for connection, _ in server.subscriptions}
+        for connection, topics in server.subscriptions:
+            subscribed[connection].update(topics)
+        assert subscribed[1] == subscribed[2]
+        assert len(subscribed[1]) == 2
+    finally:
+        feed.stop()
+        server.close()
+
+
+def test_get_without_timeout_does_not_wait():
+    feed = PriceFeed("binance", ["AAAUSDT"])
+    started = time.perf_counter()
+    assert feed.get("MISSINGUSDT", timeout=0) is None
+    assert time.perf_counter() - started < 0.1